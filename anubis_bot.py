@@ -7,6 +7,7 @@ import sys
 import logging
 import asyncio
 import traceback
+import orjson
 from datetime import datetime
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
@@ -25,6 +26,12 @@ from telegram.ext import (
 )
 from loguru import logger
 
+# uvloop is optional - fall back to the default asyncio loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Import local modules
 from database import Database
 from pump_monitor import PumpFunMonitor
@@ -37,14 +44,16 @@ logger.remove()
 logger.add(
     sys.stderr,
     format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level="DEBUG" if os.getenv('BOT_ENV') == 'development' else "INFO"
+    level="DEBUG" if os.getenv('BOT_ENV') == 'development' else "INFO",
+    enqueue=True
 )
 logger.add(
     "logs/anubis_{time}.log",
     rotation="1 day",
     retention="7 days",
     format="{time} | {level} | {name}:{function}:{line} - {message}",
-    level="DEBUG"
+    level="DEBUG",
+    enqueue=True
 )
 
 # Bot configuration
@@ -133,6 +142,10 @@ class HistoricalScanner:
             all_launches = []
             before_signature = None
             
+            # blockTime is a Unix timestamp - compare it as an int
+            start_ts = int(start_date.timestamp())
+            end_ts = int(end_date.timestamp())
+            
             while True:
                 # Get batch of signatures
                 payload = {
@@ -150,7 +163,7 @@ class HistoricalScanner:
                 }
                 
                 response = await client.post(self.helius_url, json=payload)
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 if "result" not in data or not data["result"]:
                     break
@@ -159,19 +172,19 @@ class HistoricalScanner:
                 
                 # Process signatures in this batch
                 for sig_info in signatures:
-                    block_time = sig_info.get("blockTime", 0)
+                    block_time = sig_info.get("blockTime") or 0
                     if block_time == 0:
                         continue
                     
-                    sig_date = datetime.fromtimestamp(block_time)
-                    
                     # Check date range
-                    if sig_date < start_date:
+                    if block_time < start_ts:
                         return all_launches  # We've gone too far back
                     
-                    if sig_date > end_date:
+                    if block_time > end_ts:
                         continue  # Skip future dates
                     
+                    sig_date = datetime.fromtimestamp(block_time)
+                    
                     # Get and parse transaction
                     tx_data = await self.get_transaction(client, sig_info["signature"])
                     
@@ -977,6 +990,11 @@ def main():
         # Create logs directory if it doesn't exist
         os.makedirs('logs', exist_ok=True)
         
+        # Must be installed before polling creates the event loop
+        if uvloop:
+            uvloop.install()
+        logger.debug(f"Event loop policy: {type(asyncio.get_event_loop_policy()).__name__}")
+        
         bot = AnubisBot()
         bot.run()
     except KeyboardInterrupt:
@@ -6,20 +6,46 @@ FIXED VERSION - Works with anubis schema database
 
 import asyncio
 import asyncpg
-import json
 import os
+import random
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import httpx
+import orjson
+from cachetools import LRUCache
 from loguru import logger
+from solders.signature import Signature
 from dotenv import load_dotenv
 import numpy as np
 from enum import Enum
 from dataclasses import dataclass
+from database.database import init_connection
+
+# uvloop is optional - fall back to the default asyncio loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Load environment variables
 load_dotenv()
 
+# Attempts at fetching a page's transactions before its stragglers are skipped
+PAGE_MAX_RETRIES = 5
+
+def _is_batch_rejection(data) -> bool:
+    """True if a JSON-RPC reply says the endpoint doesn't accept batch requests"""
+    if not isinstance(data, dict):
+        return False
+    
+    error = data.get("error") or {}
+    if not isinstance(error, dict):
+        return False
+    
+    # -32600 is Invalid Request, which is how non-batching servers answer an array
+    return error.get("code") == -32600 or "batch" in str(error.get("message", "")).lower()
+
 # ==================== ANUBIS CONFIGURATION ====================
 
 class TimeSlot(Enum):
@@ -82,12 +108,43 @@ class AnubisHistoricalScanner:
         self.total_scanned = 0
         self.total_launches = 0
         self.unique_wallets = set()
-        self.seen_signatures = set()
+        # Keyed by the raw 64-byte signature rather than its 88-char base58 text
+        self.seen_signatures = LRUCache(maxsize=int(os.getenv('SEEN_SIGNATURES_MAX', 65_536)))
+        
+        # Shared pooled HTTP client for Helius and Jupiter, opened on first use
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        # Max getTransaction calls per JSON-RPC batch request
+        self.rpc_batch_size = int(os.getenv('HELIUS_BATCH_SIZE', 100))
+        
+        # Bounds concurrent getTransaction calls to Helius
+        self._batch_rpc = True  # cleared if Helius rejects batch requests
+        self._fetch_sem = asyncio.Semaphore(int(os.getenv('HELIUS_MAX_CONCURRENCY', 20)))
         
         # Cache for batch processing
         self.wallet_launches = {}  # wallet -> list of launches
         self.wallet_metrics = {}    # wallet -> calculated metrics
     
+    async def _client(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP client, opened on first use
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=60.0,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+            )
+        return self._http
+    
+    async def close(self):
+        """
+        Close the shared HTTP client
+        """
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+    
     async def scan_and_score(self, days_back: int = 30, batch_size: int = 1000):
         """
         Main entry point: Scan historical data and calculate all Anubis scores
@@ -128,92 +185,255 @@ class AnubisHistoricalScanner:
         Phase 1: Collect all token launches from blockchain
         """
         start_date = datetime.now() - timedelta(days=days_back)
+        start_ts = int(start_date.timestamp())
         before_signature = None
+        page_failures = 0
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            while True:
-                try:
-                    # Get batch of signatures
-                    params = {"limit": batch_size, "commitment": "confirmed"}
-                    if before_signature:
-                        params["before"] = before_signature
-                    
-                    response = await client.post(
-                        self.helius_url,
-                        json={
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "getSignaturesForAddress",
-                            "params": [self.pump_program, params]
-                        }
-                    )
+        client = await self._client()
+        
+        while True:
+            try:
+                # Get batch of signatures
+                params = {"limit": batch_size, "commitment": "confirmed"}
+                if before_signature:
+                    params["before"] = before_signature
+                
+                response = await self._post_rpc(client, {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "getSignaturesForAddress",
+                    "params": [self.pump_program, params]
+                })
+                
+                if response.status_code != 200:
+                    logger.error("API error: {}", response.status_code)
+                    break
+                
+                data = orjson.loads(response.content)
+                signatures = data.get('result', [])
+                
+                if not signatures:
+                    break
+                
+                # Collect the page's unseen signatures down to the target date
+                pending = []
+                reached_start = False
+                for sig_info in signatures:
+                    signature = sig_info.get('signature')
+                    block_time = sig_info.get('blockTime', 0)
                     
-                    if response.status_code != 200:
-                        print(f"❌ API error: {response.status_code}")
-                        break
+                    if bytes(Signature.from_string(signature)) in self.seen_signatures:
+                        continue
                     
-                    data = response.json()
-                    signatures = data.get('result', [])
+                    # Check date range
+                    tx_date = None
+                    if block_time > 0:
+                        if block_time < start_ts:
+                            reached_start = True  # Reached target date
+                            break
+                        tx_date = datetime.fromtimestamp(block_time)
                     
-                    if not signatures:
-                        break
+                    pending.append((signature, tx_date))
+                
+                # Fetch the page's transactions in concurrent JSON-RPC batches
+                results = await self._fetch_and_process_page(client, pending)
+                
+                for signature, _ in pending:
+                    if signature not in results:
+                        continue
                     
-                    # Process each signature
-                    for sig_info in signatures:
-                        signature = sig_info.get('signature')
-                        block_time = sig_info.get('blockTime', 0)
-                        
-                        if signature in self.seen_signatures:
-                            continue
-                        self.seen_signatures.add(signature)
+                    # Only fetched transactions are marked seen, so failed ones get fetched again
+                    self.seen_signatures[bytes(Signature.from_string(signature))] = True
+                    launch_data = results[signature]
+                    if launch_data:
+                        self._cache_launch_data(launch_data)
+                        self.total_launches += 1
                         
-                        # Check date range
-                        if block_time > 0:
-                            tx_date = datetime.fromtimestamp(block_time)
-                            if tx_date < start_date:
-                                return  # Reached target date
-                        
-                        # Process transaction
-                        launch_data = await self._process_transaction(client, signature, tx_date if block_time > 0 else None)
-                        if launch_data:
-                            self._cache_launch_data(launch_data)
-                            self.total_launches += 1
-                            
-                            if self.total_launches % 50 == 0:
-                                print(f"   Processed {self.total_launches} launches from {len(self.unique_wallets)} wallets")
-                    
-                    before_signature = signatures[-1]['signature']
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    print(f"❌ Error: {e}")
-                    await asyncio.sleep(5)
+                        if self.total_launches % 50 == 0:
+                            print(f"   Processed {self.total_launches} launches from {len(self.unique_wallets)} wallets")
+                
+                # Retry the page for any transactions that couldn't be fetched
+                missing = len(pending) - len(results)
+                if missing:
+                    page_failures += 1
+                    if page_failures < PAGE_MAX_RETRIES:
+                        raise RuntimeError(f"{missing} transactions could not be fetched")
+                    logger.error("Skipping {} unfetched transactions after {} attempts", missing, page_failures)
+                page_failures = 0
+                
+                if reached_start:
+                    return
+                
+                before_signature = signatures[-1]['signature']
+                
+            except Exception as e:
+                logger.exception("Error collecting historical launches")
+                await asyncio.sleep(5)
+
+    async def _post_rpc(self, client: httpx.AsyncClient, payload: Dict, retries: int = 5) -> httpx.Response:
+        """
+        POST a JSON-RPC request, backing off and retrying while Helius rate limits (429)
+        Each attempt holds _fetch_sem only while the request is in flight
+        """
+        delay = 0.5
+        for attempt in range(retries):
+            async with self._fetch_sem:
+                response = await client.post(
+                    self.helius_url,
+                    content=orjson.dumps(payload),
+                    headers={"Content-Type": "application/json"}
+                )
+            if response.status_code != 429 or attempt == retries - 1:
+                return response
+            
+            # Honour Retry-After when given, otherwise exponential backoff with jitter
+            retry_after = response.headers.get("Retry-After")
+            wait = float(retry_after) if retry_after and retry_after.isdigit() else delay
+            await asyncio.sleep(wait + random.uniform(0, wait * 0.5))
+            delay = min(30, delay * 2)
+        
+        return response
     
-    async def _process_transaction(self, client: httpx.AsyncClient, signature: str, tx_date: datetime = None) -> Optional[Dict]:
+    async def _fetch_and_process_page(self, client: httpx.AsyncClient,
+                                      pending: List[Tuple[str, Optional[datetime]]]) -> Dict[str, Optional[Dict]]:
         """
-        Process a single transaction to extract launch data
+        Fetch a page's transactions rpc_batch_size per request and extract launch data
+        Signatures whose transaction couldn't be fetched are left out of the result
         """
-        try:
-            # Fetch full transaction
-            response = await client.post(
-                self.helius_url,
-                json={
+        chunks = [pending[i:i + self.rpc_batch_size] for i in range(0, len(pending), self.rpc_batch_size)]
+        batches = await asyncio.gather(
+            *(self._get_transactions_batch(client, [sig for sig, _ in chunk]) for chunk in chunks)
+        )
+        
+        results = {}
+        for chunk, transactions in zip(chunks, batches):
+            for sig, tx_date in chunk:
+                if sig in transactions:
+                    results[sig] = self._process_transaction_result(transactions[sig], sig, tx_date)
+        
+        return results
+    
+    async def _get_transactions_batch(self, client: httpx.AsyncClient,
+                                      signatures: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch several transactions in one JSON-RPC batch request
+        Signatures still failing after the retries are left out of the result
+        """
+        if not self._batch_rpc:
+            return await self._get_transactions_concurrent(client, signatures)
+        
+        transactions = {}
+        pending = signatures  # signatures not fetched yet
+        delay = 0.5
+        for attempt in range(PAGE_MAX_RETRIES):
+            payload = [
+                {
                     "jsonrpc": "2.0",
-                    "id": 1,
+                    "id": i,
                     "method": "getTransaction",
                     "params": [
                         signature,
                         {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}
                     ]
                 }
-            )
+                for i, signature in enumerate(pending)
+            ]
             
-            if response.status_code != 200:
-                return None
+            # One POST per attempt - this loop is the only retry layer for batches
+            response = None
+            try:
+                response = await self._post_rpc(client, payload, retries=1)
+                try:
+                    data = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    data = f"HTTP {response.status_code}"  # e.g. a plain-text 429
+            except Exception as e:
+                logger.error("Error getting {} transactions: {}", len(pending), e)
+                data = None
             
-            tx_data = response.json()
-            result = tx_data.get('result')
+            if isinstance(data, list):
+                # Responses may arrive in any order - match them back by id. Items
+                # carrying an error or missing from the reply are retried
+                failed = set(pending)
+                for item in data:
+                    index = item.get("id")
+                    if not isinstance(index, int) or not 0 <= index < len(pending) or "error" in item:
+                        continue
+                    transactions[pending[index]] = item.get("result")
+                    failed.discard(pending[index])
+                
+                if not failed:
+                    return transactions
+                
+                pending = [sig for sig in pending if sig in failed]
+                data = f"{len(pending)} items failed"
+            
+            elif _is_batch_rejection(data):
+                # Endpoint doesn't accept batches - use single calls from now on
+                logger.warning("Batch getTransaction rejected, using single calls: {}", data)
+                self._batch_rpc = False
+                transactions.update(await self._get_transactions_concurrent(client, pending))
+                return transactions
             
+            # Rate limited or a transient error - back off and retry the batch
+            if attempt < PAGE_MAX_RETRIES - 1:
+                logger.warning("Batch getTransaction failed, retrying: {}", data)
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+                wait = float(retry_after) if retry_after and retry_after.isdigit() else delay
+                await asyncio.sleep(wait + random.uniform(0, wait * 0.5))
+                delay = min(30, delay * 2)
+        
+        logger.error("Batch getTransaction for {} signatures failed after {} attempts",
+                     len(pending), PAGE_MAX_RETRIES)
+        return transactions
+    
+    async def _get_transactions_concurrent(self, client: httpx.AsyncClient,
+                                           signatures: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch transactions with single calls, leaving out the ones that failed
+        """
+        results = await asyncio.gather(
+            *(self._get_transaction(client, sig) for sig in signatures),
+            return_exceptions=True
+        )
+        
+        transactions = {}
+        for sig, result in zip(signatures, results):
+            if isinstance(result, Exception):
+                logger.error("Error getting transaction {}: {}", sig, result)
+                continue
+            transactions[sig] = result
+        return transactions
+    
+    async def _get_transaction(self, client: httpx.AsyncClient, signature: str) -> Optional[Dict]:
+        """
+        Fetch a single transaction
+        Returns None only when the transaction doesn't exist; request errors raise
+        """
+        response = await self._post_rpc(client, {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getTransaction",
+            "params": [
+                signature,
+                {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}
+            ]
+        })
+        
+        if response.status_code != 200:
+            raise RuntimeError(f"getTransaction returned HTTP {response.status_code}")
+        
+        data = orjson.loads(response.content)
+        if "error" in data:
+            raise RuntimeError(f"getTransaction failed: {data['error']}")
+        return data.get("result")
+    
+    def _process_transaction_result(self, result: Optional[Dict], signature: str,
+                                    tx_date: datetime = None) -> Optional[Dict]:
+        """
+        Extract launch data from a fetched transaction, None if it isn't a launch
+        """
+        try:
             if not result or result.get('meta', {}).get('err') is not None:
                 return None
             
@@ -298,7 +518,7 @@ class AnubisHistoricalScanner:
             }
             
         except Exception as e:
-            print(f"Error extracting data: {e}")
+            logger.exception("Error extracting launch data")
             return None
     
     def _determine_time_slot(self, hour: int) -> str:
@@ -338,37 +558,38 @@ class AnubisHistoricalScanner:
         # Group tokens by wallet for batch processing
         success_count = 0
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for wallet, launches in self.wallet_launches.items():
-                for launch in launches:
-                    mint = launch['mint']
-                    if not mint:
-                        continue
-                    
-                    # Try Jupiter API for price
-                    try:
-                        response = await client.get(
-                            f"https://price.jup.ag/v4/price?ids={mint}",
-                            timeout=10.0
-                        )
-                        
-                        if response.status_code == 200:
-                            data = response.json()
-                            if mint in data.get('data', {}):
-                                market_cap = data['data'][mint].get('marketCap', 0)
-                                launch['market_cap'] = market_cap
-                                launch['is_success'] = market_cap > 100000
-                                
-                                if launch['is_success']:
-                                    success_count += 1
-                        
-                        # Rate limiting
-                        await asyncio.sleep(0.1)
-                        
-                    except Exception:
-                        launch['market_cap'] = 0
-                        launch['is_success'] = False
+        client = await self._client()
         
+        for wallet, launches in self.wallet_launches.items():
+            for launch in launches:
+                mint = launch['mint']
+                if not mint:
+                    continue
+                
+                # Try Jupiter API for price
+                try:
+                    response = await client.get(
+                        f"https://price.jup.ag/v4/price?ids={mint}",
+                        timeout=10.0
+                    )
+                    
+                    if response.status_code == 200:
+                        data = orjson.loads(response.content)
+                        if mint in data.get('data', {}):
+                            market_cap = data['data'][mint].get('marketCap', 0)
+                            launch['market_cap'] = market_cap
+                            launch['is_success'] = market_cap > 100000
+                            
+                            if launch['is_success']:
+                                success_count += 1
+                    
+                    # Rate limiting
+                    await asyncio.sleep(0.1)
+                    
+                except Exception:
+                    launch['market_cap'] = 0
+                    launch['is_success'] = False
+    
         print(f"   Found {success_count} successful tokens (>$100K mcap)")
     
     async def _calculate_earnings(self):
@@ -605,7 +826,7 @@ class AnubisHistoricalScanner:
                                 launch.get('signature')
                             )
                         except Exception as e:
-                            print(f"Error storing launch: {e}")
+                            logger.exception("Error storing launch")
             
             # Store wallet profiles with all Anubis metrics
             for wallet, metrics in self.wallet_metrics.items():
@@ -675,7 +896,7 @@ class AnubisHistoricalScanner:
                         (metrics.get('last_active') - metrics.get('first_seen')).days if metrics.get('first_seen') and metrics.get('last_active') else 0,
                         metrics.get('alert_priority', 'STANDARD'),
                         True,  # is_active
-                        json.dumps({  # Store extra metrics in tags JSONB
+                        {  # Store extra metrics in tags JSONB
                             'weekend_ratio': metrics.get('weekend_ratio', 0),
                             'asia_session_ratio': metrics.get('asia_session_ratio', 0),
                             'eu_session_ratio': metrics.get('eu_session_ratio', 0),
@@ -688,10 +909,10 @@ class AnubisHistoricalScanner:
                             'seed_variance': float(metrics.get('seed_variance', 0)),
                             'avg_mcap_achieved': float(metrics.get('avg_mcap_achieved', 0)),
                             'roi': metrics.get('roi', 0)
-                        })
+                        }
                     )
                 except Exception as e:
-                    print(f"Error storing profile for {wallet}: {e}")
+                    logger.exception("Error storing profile for {}", wallet)
     
     async def _print_comprehensive_summary(self):
         """
@@ -770,19 +991,26 @@ async def connect_database():
         
         DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?sslmode=require"
     
-    print("Connecting to DigitalOcean database...")
+    logger.info("Connecting to DigitalOcean database...")
     
     return await asyncpg.create_pool(
         DATABASE_URL,
         ssl='require',
-        min_size=1,
-        max_size=10
+        min_size=int(os.getenv('DB_POOL_MIN', 8)),
+        max_size=int(os.getenv('DB_POOL_MAX', 32)),
+        max_inactive_connection_lifetime=300,
+        command_timeout=15,
+        statement_cache_size=256,
+        # Startup parameter, so it survives the RESET ALL run on release - the
+        # launch/profile tables are append-heavy scan output, so commits don't
+        # wait on WAL flush
+        server_settings={'synchronous_commit': 'off'},
+        init=init_connection
     )
 
 async def main():
     """Run complete historical scanner with Anubis scoring"""
-    print("🏛️ ANUBIS COMPLETE HISTORICAL SCANNER")
-    print("="*60)
+    logger.info("🏛️ ANUBIS COMPLETE HISTORICAL SCANNER")
     
     # Get parameters
     days_back = int(os.getenv('SCAN_DAYS', 7))
@@ -791,22 +1019,29 @@ async def main():
     try:
         # Connect to database
         db = await connect_database()
-        print("✅ Database connected!")
+        logger.info("✅ Database connected!")
         
         # Note: Tables already created by setup_anubis_database.sh
-        print("✅ Using existing anubis schema!")
+        logger.info("✅ Using existing anubis schema!")
         
         # Create and run scanner
         scanner = AnubisHistoricalScanner(db)
-        await scanner.scan_and_score(days_back, batch_size)
+        try:
+            await scanner.scan_and_score(days_back, batch_size)
+        finally:
+            await scanner.close()
         
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Historical scanner failed")
     finally:
         if 'db' in locals():
             await db.close()
 
 if __name__ == "__main__":
+    logger.remove()
+    logger.add(sys.stderr, level=os.getenv('LOG_LEVEL', 'INFO'), enqueue=True)
+    
+    if uvloop:
+        uvloop.install()
+    logger.info(f"Event loop policy: {type(asyncio.get_event_loop_policy()).__name__}")
     asyncio.run(main())
\ No newline at end of file
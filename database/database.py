@@ -5,12 +5,28 @@ Handles all database operations with NO hardcoded data
 
 import asyncio
 import asyncpg
+import orjson
 import os
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from loguru import logger
 from contextlib import asynccontextmanager
 
+async def init_connection(conn: asyncpg.Connection):
+    """
+    Per-connection setup for every pool
+    JSONB values are encoded/decoded with orjson in binary format,
+    so dicts can be passed as query arguments directly
+    """
+    await conn.set_type_codec(
+        'jsonb',
+        # Binary JSONB is the JSON text behind a one-byte version prefix
+        encoder=lambda value: b'\x01' + orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY),
+        decoder=lambda data: orjson.loads(data[1:]),
+        schema='pg_catalog',
+        format='binary'
+    )
+
 class Database:
     """Database connection manager for Anubis Bot"""
     
@@ -26,7 +42,9 @@ class Database:
                 min_size=5,
                 max_size=20,
                 timeout=60,
-                command_timeout=60
+                command_timeout=60,
+                statement_cache_size=1024,
+                init=init_connection
             )
             logger.info("Database connection pool created")
             
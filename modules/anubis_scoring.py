@@ -16,7 +16,7 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
 from enum import Enum
-import json
+from database.database import init_connection
 
 # ==================== CONFIGURATION ====================
 
@@ -1028,7 +1028,7 @@ async def main():
     """Example usage of the Anubis Scoring System"""
     
     # Initialize database connection
-    db_pool = await asyncpg.create_pool(DATABASE_URL)
+    db_pool = await asyncpg.create_pool(DATABASE_URL, init=init_connection)
     
     # Create tables
     async with db_pool.acquire() as conn:
@@ -2,6 +2,7 @@
 import asyncio
 from datetime import datetime, timedelta
 from modules.wallet_scanner import WalletScanner
+from database.database import init_connection
 import asyncpg
 import os
 from dotenv import load_dotenv
@@ -12,11 +13,11 @@ async def test_minimal_scan():
     """Run a very small test scan - just 1 hour of data"""
     
     # Create database pool
-    db_pool = await asyncpg.create_pool(os.getenv('DATABASE_URL'))
+    db_pool = await asyncpg.create_pool(os.getenv('DATABASE_URL'), init=init_connection)
+    
+    scanner = WalletScanner(db_pool)
     
     try:
-        scanner = WalletScanner(db_pool)
-        
         # Test with just 1 hour of recent data
         end_date = datetime.now()
         start_date = end_date - timedelta(hours=1)  # Just 1 hour!
@@ -56,6 +57,7 @@ async def test_minimal_scan():
         import traceback
         traceback.print_exc()
     finally:
+        await scanner.close()
         await db_pool.close()
 
 if __name__ == "__main__":
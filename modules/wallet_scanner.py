@@ -5,14 +5,20 @@ Complete implementation for historical scanning and real-time monitoring
 
 import asyncio
 import asyncpg
-import json
 import os
+import random
+import re
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import httpx
+import orjson
+import pandas as pd
+from cachetools import TTLCache
 from websockets import connect
 from loguru import logger
-import base58
+from solders.pubkey import Pubkey
 from modules.anubis_scoring import AnubisScoringEngine, AnubisAlertSystem
 from dotenv import load_dotenv
 import aiohttp
@@ -20,12 +26,189 @@ import aiohttp
 # Load environment variables
 load_dotenv()
 
+# Log keywords that flag a realtime message as a possible launch
+_LAUNCH_RE = re.compile(r"create|initialize|mint", re.IGNORECASE)
+
+_EMOJI_LAUNCH = "🚀"
+
+# Per-platform log patterns that mark a historical transaction as a launch.
+# Logs are joined with newlines and [^\n] keeps each match within one log line.
+_PLATFORM_LAUNCH_RE = {
+    "pump_fun": re.compile(
+        r"Program log: Instruction: Create|(?i:create[^\n]*token|token[^\n]*create)"
+    ),
+    "raydium_launchlab": re.compile(r"initialize", re.IGNORECASE),
+}
+
+# Log lines that mark a Pump.fun transaction as a token creation
+_PUMP_CREATE_RE = re.compile("|".join(map(re.escape, [
+    "Program log: Instruction: Create",
+    "create_pump",
+    "InitializeMint",
+    "init_pump_token"
+])))
+
+# Historical launches below these thresholds are assumed never to have crossed
+# the $100K success mark, so their market cap is not fetched. Without this gate
+# every historical launch costs a Jupiter round-trip just to be filtered out.
+MCAP_CHECK_MIN_LIQUIDITY_SOL = 2.0
+MCAP_CHECK_MIN_AGE_SECS = 3600
+
+# Tasks draining the realtime notification queue
+REALTIME_WORKERS = 8
+
+# Realtime launches are written once this many are buffered, or every interval
+REALTIME_FLUSH_ROWS = 100
+REALTIME_FLUSH_SECS = 0.5
+# Most launches kept buffered while the database can't take them
+REALTIME_BUFFER_MAX = 10_000
+
+# Mints per Jupiter price request
+JUPITER_BATCH_SIZE = 100
+
+# Historical launches are COPYed into staging in chunks of this many rows
+HISTORICAL_COPY_CHUNK = 10_000
+
+# Attempts per Helius request while rate limited (429), and failed signature
+# pages in a row before a historical walk gives up
+RPC_MAX_RETRIES = 5
+SCAN_PAGE_MAX_RETRIES = 5
+
+# Buffered inserts are flushed once this many rows are pending or the oldest
+# pending row has waited this long
+WRITE_FLUSH_SIZE = 50
+WRITE_FLUSH_SECS = 2.0
+
+# Launch probability adjustment per funding source type
+_FUNDING_ADJUSTMENT = {'clean': 0.1, 'suspicious': -0.2}
+
+def _launch_prob(initial_liquidity: float, funding_adjustment: float,
+                 behavior_score: float) -> float:
+    """Launch success probability from liquidity, funding and behavior"""
+    base_prob = 0.15
+    
+    # Adjust based on liquidity
+    if initial_liquidity >= 5:
+        base_prob += 0.3
+    elif initial_liquidity >= 3:
+        base_prob += 0.15
+    
+    # Funding source adjustment, then behavior score factor
+    base_prob += funding_adjustment
+    base_prob *= behavior_score / 100
+    
+    return min(1.0, base_prob)
+
+@dataclass(slots=True)
+class LaunchMeta:
+    """Token details known at launch time, passed along to developer checks"""
+    mint: str
+    symbol: str = 'UNKNOWN'
+    name: str = 'Unknown'
+    market_cap: float = 0.0
+
+@dataclass(slots=True)
+class LaunchInfo:
+    """A parsed token launch, as it moves from parsing to storage and alerts"""
+    signature: str
+    platform: str
+    launch_time: datetime
+    creator_wallet: Optional[str] = None
+    mint_address: Optional[str] = None
+    token_name: Optional[str] = None
+    token_symbol: Optional[str] = None
+    initial_liquidity_sol: float = 0.0
+    metadata: Dict = field(default_factory=dict)
+
+def _to_naive_local(value: datetime) -> datetime:
+    """Convert an aware datetime to naive local time, matching the scan_checkpoints columns"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+def _retry_wait(response: Optional[httpx.Response], delay: float) -> float:
+    """Seconds to wait before retrying - Retry-After when given, else delay, plus jitter"""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    wait = float(retry_after) if retry_after and retry_after.isdigit() else delay
+    return wait + random.uniform(0, wait * 0.5)
+
+def _is_batch_rejection(data) -> bool:
+    """True if a JSON-RPC reply says the endpoint doesn't accept batch requests"""
+    if not isinstance(data, dict):
+        return False
+    
+    error = data.get("error") or {}
+    if not isinstance(error, dict):
+        return False
+    
+    # -32600 is Invalid Request, which is how non-batching servers answer an array
+    return error.get("code") == -32600 or "batch" in str(error.get("message", "")).lower()
+
+def _is_pubkey(address: str) -> bool:
+    """True if address decodes to a 32-byte Solana public key"""
+    try:
+        Pubkey.from_string(address)
+        return True
+    except ValueError:
+        return False
+
+def _slim_transaction(result: Optional[Dict]) -> Optional[Dict]:
+    """
+    Keep only the fields launch parsing reads from a jsonParsed transaction,
+    so the rest of the decoded tree is freed as soon as a batch is unpacked
+    """
+    if not result or "meta" not in result:
+        return result
+    
+    # Any of these keys may be present with a null value
+    transaction = result.get("transaction") or {}
+    message = transaction.get("message") or {}
+    meta = result["meta"] or {}
+    return {
+        "transaction": {
+            "signatures": (transaction.get("signatures") or [])[:1],
+            "message": {
+                "accountKeys": [
+                    {"pubkey": key.get("pubkey")}
+                    for key in message.get("accountKeys") or []
+                ]
+            }
+        },
+        "meta": {
+            "err": meta.get("err"),
+            "logMessages": meta.get("logMessages") or [],
+            "innerInstructions": [
+                {"instructions": [
+                    instruction for instruction in inner.get("instructions") or []
+                    if instruction.get("program") == "spl-token"
+                ]}
+                for inner in meta.get("innerInstructions") or []
+            ],
+            "preBalances": (meta.get("preBalances") or [])[:1],
+            "postBalances": (meta.get("postBalances") or [])[:1]
+        }
+    }
+
 class WalletScanner:
     """
     Combined scanner for historical data and real-time monitoring
     Handles Pump.fun and Raydium LaunchLab (includes LetsBonk.fun)
     """
     
+    # Stores a realtime launch and adds it to active monitoring in a single round-trip
+    _REALTIME_LAUNCH_SQL = """
+        WITH launch AS (
+            INSERT INTO anubis.token_launches 
+            (mint_address, creator, platform, created_at, 
+             initial_liquidity, signature, metadata)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            ON CONFLICT (mint_address) DO NOTHING
+        )
+        INSERT INTO anubis.active_monitoring
+        (wallet_address, token_address, platform, detected_at)
+        VALUES ($2, $1, $3, NOW())
+    """
+    
     def __init__(self, db):
         self.db = db
         self.helius_key = os.getenv('HELIUS_API_KEY', 'dummy_key_for_testing')
@@ -34,6 +217,10 @@ class WalletScanner:
         self.helius_url = f"https://mainnet.helius-rpc.com/?api-key={self.helius_key}"
         self.helius_ws_url = f"wss://mainnet.helius-rpc.com/?api-key={self.helius_key}"
         
+        # Commitment for realtime log subscriptions ("processed" is faster, but
+        # getTransaction can't return those transactions until they confirm)
+        self.ws_commitment = os.getenv('HELIUS_WS_COMMITMENT', 'confirmed')
+        
         # Anubis Scoring System
         self.scoring_engine = None
         self.alert_system = AnubisAlertSystem(db, None)
@@ -56,11 +243,92 @@ class WalletScanner:
             "total": 0,
             "last_checkpoint": None
         }
+        
+        # Market cap cache (mint -> mcap) and in-flight Jupiter lookups
+        self._mcap_cache = TTLCache(maxsize=50_000, ttl=120)
+        self._mcap_inflight: Dict[str, asyncio.Task] = {}
+        
+        # Token metadata cache (mint -> metadata) and in-flight metadata fetches
+        self._metadata_cache = TTLCache(maxsize=10_000, ttl=3600)
+        self._metadata_inflight: Dict[str, asyncio.Task] = {}
+        
+        # Developer profile cache (wallet -> wallet_profiles row, None if no profile)
+        self._profile_cache = TTLCache(maxsize=10_000, ttl=60)
+        
+        # Bounds concurrent getTransaction calls to Helius
+        self._fetch_sem = asyncio.Semaphore(int(os.getenv('HELIUS_MAX_CONCURRENCY', 20)))
+        
+        # Max getTransaction calls per JSON-RPC batch request
+        self.rpc_batch_size = int(os.getenv('HELIUS_BATCH_SIZE', 100))
+        self._batch_rpc = True
+        
+        # Dedicated connection holding the prepared realtime launch statement
+        self._write_conn = None
+        self._launch_stmt = None
+        self._write_lock = asyncio.Lock()
+        
+        # Detected launches (mint, creator, platform) waiting for the DB writer,
+        # then for the alert worker once stored
+        self.launch_q: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._alert_q: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._workers: List[asyncio.Task] = []
+        # Rows the DB writer was holding when it was cancelled, stored by close()
+        self._unstored_launches: List[tuple] = []
+        
+        # WebSocket log notifications (handler, value, platform) waiting for a worker
+        self._realtime_q: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+        self._realtime_workers: List[asyncio.Task] = []
+        
+        # Realtime launches waiting for the next flush, then for their alert check
+        self._launch_buf: List[Dict] = []
+        self._realtime_alert_q: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+        
+        # Buffered metadata retry mints
+        self._pending_retries: List[tuple] = []
+        self._retries_since = time.monotonic()
+        
+        # Shared pooled HTTP client, opened by start()
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        # Shared aiohttp session for Telegram and Helius REST calls, opened on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """Open the shared HTTP client used for all Helius and Jupiter calls"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=256, max_keepalive_connections=64),
+                timeout=httpx.Timeout(10.0, connect=3.0)
+            )
+
+    async def _client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, opened on first use"""
+        if self._http is None:
+            await self.start()
+        return self._http
+
+    async def _aiohttp_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session, opened on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
 
     async def start_scanning(self):
         """Main scanning loop - starts all scanners"""
-        print("🚀 Starting wallet scanner...")
-        print("👀 Monitoring Pump.fun and Raydium LaunchLab...")
+        await self.start()
+        
+        logger.info("🚀 Starting wallet scanner...")
+        logger.info("👀 Monitoring Pump.fun and Raydium LaunchLab...")
+        
+        # Storage and alerting run off the detection path
+        self._workers = [
+            asyncio.create_task(self._db_writer()),
+            asyncio.create_task(self._alert_worker())
+        ]
         
         # Start the scanning tasks
         tasks = []
@@ -77,191 +345,216 @@ class WalletScanner:
         else:
             # Fallback - just run a simple scan loop
             while True:
-                print(f"Scanning... {datetime.now()}")
+                logger.info("Scanning... {}", datetime.now())
                 await asyncio.sleep(30)
 
     async def scan_pump_historical(self):
-        """Monitor Pump.fun program directly via RPC"""
-        print("📊 Monitoring Pump.fun program directly...")
+        """Monitor Pump.fun program directly via a WebSocket log subscription"""
+        logger.info("📊 Monitoring Pump.fun program directly...")
         
-        pump_program = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
-        seen_signatures = set()  # Track what we've already processed
+        await self._monitor_programs(
+            {"pump_fun": self.programs["pump_fun"]},
+            self._process_pump_log
+        )
+
+    async def _process_pump_log(self, log_result: Dict, platform: str):
+        """Detect a Pump.fun launch from a logsSubscribe notification"""
+        if log_result.get("err") is not None:
+            return
         
+        # Better launch detection - one scan over all the logs
+        logs = log_result.get("logs", [])
+        if _PUMP_CREATE_RE.search("\n".join(logs)) is None:
+            return
+        
+        # Only launches need the full transaction, for the creator and mint
+        signature = log_result.get("signature")
+        client = await self._client()
+        result = await self._get_transaction(client, signature)
+        
+        if not result:
+            return
+        
+        pump_program = self.programs["pump_fun"]
+        
+        # Extract creator
+        account_keys = result.get('transaction', {}).get('message', {}).get('accountKeys', [])
+        creator = account_keys[0].get('pubkey') if account_keys else 'UNKNOWN'
+        
+        # Find mint in account keys
+        mint = None
+        for key in account_keys[1:4]:
+            address = key.get('pubkey', '')
+            if (address != pump_program and not address.startswith('11111')
+                    and _is_pubkey(address)):
+                mint = address
+                break
+        
+        if mint:
+            logger.info("{} New pump_fun launch: {} by {}", _EMOJI_LAUNCH, mint, creator)
+            logger.debug("Launch signature: {}", signature)
+            
+            # Hand off to the DB writer - only blocks if the writer is 1000 behind
+            await self.launch_q.put((mint, creator, platform))
+
+    async def _db_writer(self):
+        """Drain detected launches from launch_q and store them in batches"""
         while True:
+            # Wait for one launch, then take whatever else is already queued
+            rows = [await self.launch_q.get()]
+            while len(rows) < WRITE_FLUSH_SIZE and not self.launch_q.empty():
+                rows.append(self.launch_q.get_nowait())
+            
+            stored = False
             try:
-                async with httpx.AsyncClient() as client:
-                    # Get recent signatures
-                    response = await client.post(
-                        self.helius_url,
-                        json={
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "getSignaturesForAddress",
-                            "params": [pump_program, {"limit": 100}]
-                        },
-                        timeout=30.0
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        signatures = data.get('result', [])
-                        
-                        for sig_info in signatures:
-                            signature = sig_info.get('signature')
-                            
-                            # Skip if we've seen this one
-                            if signature in seen_signatures:
-                                continue
-                            seen_signatures.add(signature)
-                            
-                            # Fetch full transaction
-                            tx_response = await client.post(
-                                self.helius_url,
-                                json={
-                                    "jsonrpc": "2.0",
-                                    "id": 1,
-                                    "method": "getTransaction",
-                                    "params": [
-                                        signature,
-                                        {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}
-                                    ]
-                                },
-                                timeout=30.0
-                            )
-                            
-                            if tx_response.status_code == 200:
-                                tx_data = tx_response.json()
-                                result = tx_data.get('result')
-                                
-                                if result and result.get('meta', {}).get('err') is None:
-                                    logs = result.get('meta', {}).get('logMessages', [])
-                                    
-                                    # Better launch detection
-                                    is_launch = False
-                                    for log in logs:
-                                        if any(pattern in log for pattern in [
-                                            "Program log: Instruction: Create",
-                                            "create_pump",
-                                            "InitializeMint",
-                                            "init_pump_token"
-                                        ]):
-                                            is_launch = True
-                                            break
-                                    
-                                    if is_launch:
-                                        # Extract creator
-                                        account_keys = result.get('transaction', {}).get('message', {}).get('accountKeys', [])
-                                        creator = account_keys[0].get('pubkey') if account_keys else 'UNKNOWN'
-                                        
-                                        # Find mint in account keys
-                                        mint = None
-                                        for key in account_keys[1:4]:
-                                            address = key.get('pubkey', '')
-                                            if len(address) == 44 and address != pump_program:
-                                                mint = address
-                                                break
-                                        
-                                        if mint:
-                                            print(f"   🚀 NEW TOKEN LAUNCH!")
-                                            print(f"      Mint: {mint}")
-                                            print(f"      Creator: {creator}")
-                                            print(f"      Signature: {signature[:20]}...")
-                                            
-                                            # Store in database
-                                            async with self.db.acquire() as conn:
-                                                await conn.execute("""
-                                                    INSERT INTO anubis.token_launches 
-                                                    (mint_address, creator, platform, created_at)
-                                                    VALUES ($1, $2, $3, NOW())
-                                                    ON CONFLICT (mint_address) DO NOTHING
-                                                """, mint, creator, 'pump_fun')
-                                            
-                                            # Check developer and send alerts
-                                            await self.check_developer_profile(creator, {
-                                                'mint': mint,
-                                                'symbol': 'UNKNOWN',
-                                                'name': 'Unknown',
-                                                'market_cap': 0
-                                            })
-                
-                print(f"⏰ Checked {len(signatures)} transactions, waiting 30 seconds...")
-                await asyncio.sleep(30)
+                await self._store_launches(rows)
+                stored = True
                 
+                # Profiles are built from token_launches, so alert only once stored
+                for mint, creator, _ in rows:
+                    await self._alert_q.put((mint, creator))
             except Exception as e:
-                print(f"❌ Error: {e}")
-                await asyncio.sleep(30)
+                logger.error(f"Error storing {len(rows)} launches: {e}")
+            except BaseException:
+                # Cancelled mid-write - hand the rows to close() instead of losing them
+                if not stored:
+                    self._unstored_launches.extend(rows)
+                raise
+            finally:
+                for _ in rows:
+                    self.launch_q.task_done()
+
+    async def _alert_worker(self):
+        """Check the developer behind each stored launch and send alerts"""
+        while True:
+            mint, creator = await self._alert_q.get()
+            try:
+                await self.check_developer_profile(creator, LaunchMeta(mint=mint))
+            finally:
+                self._alert_q.task_done()
+
+    async def _store_launches(self, rows: List[tuple]):
+        """Write token_launches rows in one executemany"""
+        async with self.db.acquire() as conn:
+            await conn.executemany("""
+                INSERT INTO anubis.token_launches 
+                (mint_address, creator, platform, created_at)
+                VALUES ($1, $2, $3, NOW())
+                ON CONFLICT (mint_address) DO NOTHING
+            """, rows)
+
+    async def _queue_metadata_retry(self, mint_address: str):
+        """Buffer a metadata_retry_queue row, flushing when the batch is full or stale"""
+        if not self._pending_retries:
+            self._retries_since = time.monotonic()
+        self._pending_retries.append((mint_address,))
+        
+        if (len(self._pending_retries) >= WRITE_FLUSH_SIZE or
+                time.monotonic() - self._retries_since >= WRITE_FLUSH_SECS):
+            await self._flush_pending_retries()
+
+    async def _flush_pending_retries(self):
+        """Write all buffered metadata_retry_queue rows in one executemany"""
+        if not self._pending_retries:
+            return
+        
+        rows, self._pending_retries = self._pending_retries, []
+        try:
+            async with self.db.acquire() as conn:
+                await conn.executemany("""
+                    INSERT INTO metadata_retry_queue (mint_address, retry_count, next_retry)
+                    VALUES ($1, 0, NOW() + INTERVAL '1 minute')
+                    ON CONFLICT (mint_address) DO NOTHING
+                """, rows)
+        except Exception as e:
+            logger.error(f"Error queueing {len(rows)} metadata retries: {e}")
 
     async def get_token_creator(self, mint_address):
         """Get creator from the blockchain directly"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.helius_url,
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getSignaturesForAddress",
-                    "params": [mint_address, {"limit": 1}]
-                }
-            )
-            # Parse response to find creator...
-            return response.json()
+        client = await self._client()
+        response = await client.post(
+            self.helius_url,
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getSignaturesForAddress",
+                "params": [mint_address, {"limit": 1}]
+            }
+        )
+        # Parse response to find creator...
+        return orjson.loads(response.content)
 
-    async def check_developer_profile(self, creator, metadata=None):
+    async def check_developer_profile(self, creator, metadata: Optional[LaunchMeta] = None):
         """Check if developer has an Anubis profile and send alerts if needed"""
         try:
-            async with self.db.acquire() as conn:
-                # Check for existing profile
-                profile = await conn.fetchrow(
-                    "SELECT * FROM anubis.wallet_profiles WHERE wallet_address = $1",
-                    creator
+            # Check for existing profile
+            profile = await self._get_developer_profile(creator)
+            
+            if profile:
+                logger.info(
+                    "👤 Developer {} - tier {}, score {:.1f}, risk {}",
+                    creator, profile['developer_tier'], profile['anubis_score'], profile['risk_level']
                 )
                 
-                if profile:
-                    print(f"   👤 Developer Tier: {profile['developer_tier']}")
-                    print(f"   📊 Anubis Score: {profile['anubis_score']:.1f}")
-                    print(f"   ⚠️  Risk Level: {profile['risk_level']}")
+                # Send alerts based on tier
+                if profile['developer_tier'] == 'ELITE':
+                    logger.warning("🚨 ELITE DEVELOPER DETECTED: {}", creator)
+                    await self.send_telegram_alert(
+                        f"🚨 ELITE Developer Launch!\n"
+                        f"Wallet: {creator[:8]}...{creator[-6:]}\n"
+                        f"Score: {profile['anubis_score']:.1f}\n"
+                        f"Success Rate: {profile['success_rate']:.1%}\n"
+                        f"Token: {metadata.name if metadata else 'Unknown'}"
+                    )
+                elif profile['developer_tier'] == 'SCAMMER':
+                    logger.warning("⛔ KNOWN SCAMMER: {}", creator)
+                    # Optionally send scammer alerts
                     
-                    # Send alerts based on tier
-                    if profile['developer_tier'] == 'ELITE':
-                        print(f"   🚨 ELITE DEVELOPER DETECTED!")
-                        await self.send_telegram_alert(
-                            f"🚨 ELITE Developer Launch!\n"
-                            f"Wallet: {creator[:8]}...{creator[-6:]}\n"
-                            f"Score: {profile['anubis_score']:.1f}\n"
-                            f"Success Rate: {profile['success_rate']:.1%}\n"
-                            f"Token: {metadata.get('name', 'Unknown') if metadata else 'Unknown'}"
-                        )
-                    elif profile['developer_tier'] == 'SCAMMER':
-                        print(f"   ⛔ KNOWN SCAMMER!")
-                        # Optionally send scammer alerts
-                        
-                else:
-                    print(f"   👤 New developer (no profile yet)")
+            else:
+                logger.debug("👤 New developer (no profile yet): {}", creator)
+                
+                # Calculate profile for new developer
+                await self.create_developer_profile(creator)
                     
-                    # Calculate profile for new developer
-                    await self.create_developer_profile(creator)
-                        
         except Exception as e:
-            print(f"   ⚠️ Profile check failed: {e}")
+            logger.error("Profile check failed for {}: {}", creator, e)
             pass  # Continue without profile check
 
+    async def _get_developer_profile(self, wallet_address: str) -> Optional[asyncpg.Record]:
+        """Get a developer's wallet_profiles row, cached for a short TTL"""
+        if wallet_address in self._profile_cache:
+            return self._profile_cache[wallet_address]
+        
+        async with self.db.acquire() as conn:
+            profile = await conn.fetchrow(
+                """
+                SELECT developer_tier, anubis_score, risk_level, success_rate
+                FROM anubis.wallet_profiles WHERE wallet_address = $1
+                """,
+                wallet_address
+            )
+        
+        self._profile_cache[wallet_address] = profile
+        return profile
+
     async def create_developer_profile(self, wallet_address):
         """Create Anubis profile for new developer"""
         try:
             async with self.db.acquire() as conn:
-                # Get launch history for this wallet
-                launches = await conn.fetch("""
-                    SELECT * FROM anubis.token_launches 
-                    WHERE creator = $1 
-                    ORDER BY created_at DESC
+                # Aggregate launch history for this wallet in the database
+                history = await conn.fetchrow("""
+                    SELECT COUNT(*) AS total,
+                           COUNT(*) FILTER (WHERE peak_mcap >= 100000) AS successful
+                    FROM anubis.token_launches 
+                    WHERE creator = $1
                 """, wallet_address)
                 
-                if not launches:
+                if not history['total']:
                     return  # No history to calculate from
                 
                 # Calculate basic metrics
-                total_launches = len(launches)
-                successful = sum(1 for l in launches if l.get('peak_mcap', 0) >= 100000)
+                total_launches = history['total']
+                successful = history['successful']
                 success_rate = successful / total_launches if total_launches > 0 else 0
                 
                 # Calculate Anubis score (simplified)
@@ -297,10 +590,11 @@ class WalletScanner:
                 """, wallet_address, score, tier, risk_level, 
                     total_launches, success_rate, 1.0 - success_rate)
                 
-                print(f"   ✅ Created profile: {tier} (Score: {score:.1f})")
+                self._profile_cache.pop(wallet_address, None)
+                logger.info("✅ Created profile for {}: {} (Score: {:.1f})", wallet_address, tier, score)
                 
         except Exception as e:
-            print(f"   ⚠️ Failed to create profile: {e}")
+            logger.error("Failed to create profile for {}: {}", wallet_address, e)
 
     async def send_telegram_alert(self, message):
         """Send alert to Telegram"""
@@ -309,20 +603,21 @@ class WalletScanner:
             chat_id = os.getenv('TELEGRAM_CHAT_ID')  # Add this to your .env
             
             if not bot_token or not chat_id:
-                print("   ⚠️ Telegram not configured")
+                logger.warning("Telegram not configured")
                 return
                 
             url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
             
-            async with aiohttp.ClientSession() as session:
-                await session.post(url, json={
-                    'chat_id': chat_id,
-                    'text': message,
-                    'parse_mode': 'HTML'
-                })
+            session = await self._aiohttp_session()
+            async with session.post(url, json={
+                'chat_id': chat_id,
+                'text': message,
+                'parse_mode': 'HTML'
+            }):
+                pass
                 
         except Exception as e:
-            print(f"   ⚠️ Telegram alert failed: {e}")
+            logger.error("Telegram alert failed: {}", e)
 
     async def evaluate_new_launcher(self, creator, token_address, initial_liquidity):
         """Quick safety check for unknown wallets"""
@@ -338,7 +633,7 @@ class WalletScanner:
             funding_check = await self.check_funding_source(creator)
             
             if funding_check['is_suspicious']:
-                print(f"   ❌ Suspicious funding from: {funding_check['source']}")
+                logger.info("❌ Suspicious funding from: {}", funding_check['source'])
                 return None
                 
             # Basic behavioral checks
@@ -376,9 +671,9 @@ class WalletScanner:
             'limit': 5
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                txs = await response.json()
+        session = await self._aiohttp_session()
+        async with session.get(url, params=params) as response:
+            txs = await response.json(loads=orjson.loads)
         
         # Check for red flags
         for tx in txs:
@@ -398,55 +693,42 @@ class WalletScanner:
         score = 50  # Start neutral
         
         async with self.db.acquire() as conn:
-            # Check launch velocity (too many too fast = bad)
-            recent_launches = await conn.fetchval("""
-                SELECT COUNT(*) FROM anubis.token_launches
-                WHERE creator = $1 
-                AND created_at > NOW() - INTERVAL '1 hour'
-            """, wallet)
-            
-            if recent_launches and recent_launches > 3:
-                score -= 30  # Serial rugger pattern
-            elif recent_launches == 0:
-                score += 10  # First launch today
-                
-            # Check if wallet has rugged before
-            has_rugged = await conn.fetchval("""
-                SELECT EXISTS(
-                    SELECT 1 FROM anubis.token_launches
-                    WHERE creator = $1
-                    AND peak_mcap < 10000
-                    AND initial_liquidity > 0.5
-                )
+            # Launch velocity and rug history in one round-trip
+            behavior = await conn.fetchrow("""
+                SELECT
+                    (SELECT COUNT(*) FROM anubis.token_launches
+                     WHERE creator = $1
+                     AND created_at > NOW() - INTERVAL '1 hour') AS recent_launches,
+                    EXISTS(
+                        SELECT 1 FROM anubis.token_launches
+                        WHERE creator = $1
+                        AND peak_mcap < 10000
+                        AND initial_liquidity > 0.5
+                    ) AS has_rugged
             """, wallet)
+        
+        # Check launch velocity (too many too fast = bad)
+        recent_launches = behavior['recent_launches']
+        if recent_launches and recent_launches > 3:
+            score -= 30  # Serial rugger pattern
+        elif recent_launches == 0:
+            score += 10  # First launch today
             
-            if has_rugged:
-                score -= 25
+        # Check if wallet has rugged before
+        if behavior['has_rugged']:
+            score -= 25
                 
         return max(0, min(100, score))
 
     def calculate_launch_probability(self, initial_liquidity, funding_source, 
                                     launch_time, behavior_score):
         """Calculate success probability based on factors"""
-        base_prob = 0.15
-        
-        # Adjust based on liquidity
-        if initial_liquidity >= 5:
-            base_prob += 0.3
-        elif initial_liquidity >= 3:
-            base_prob += 0.15
-            
-        # Funding source adjustment
-        if funding_source == 'clean':
-            base_prob += 0.1
-        elif funding_source == 'suspicious':
-            base_prob -= 0.2
-            
-        # Behavior score factor
-        base_prob *= (behavior_score / 100)
-        
         return {
-            'probability': min(1.0, base_prob),
+            'probability': _launch_prob(
+                float(initial_liquidity),
+                _FUNDING_ADJUSTMENT.get(funding_source, 0.0),
+                float(behavior_score)
+            ),
             'risks': []
         }
 
@@ -469,69 +751,35 @@ class WalletScanner:
         await self.send_telegram_alert(message)
 
     async def fetch_token_metadata(self, mint_address: str) -> dict:
+        """
+        Fetch token metadata - successful lookups are cached, and concurrent
+        callers for the same mint share one in-flight fetch
+        """
+        if mint_address in self._metadata_cache:
+            return self._metadata_cache[mint_address]
+        
+        task = self._metadata_inflight.get(mint_address)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_token_metadata(mint_address))
+            self._metadata_inflight[mint_address] = task
+            task.add_done_callback(lambda _: self._metadata_inflight.pop(mint_address, None))
+        
+        metadata = await asyncio.shield(task)
+        if metadata['symbol'] != 'UNKNOWN':
+            self._metadata_cache[mint_address] = metadata
+        return metadata
+
+    async def _fetch_token_metadata(self, mint_address: str) -> dict:
         """
         Fetch token metadata - tries multiple methods to ensure we get the data
         """
         metadata = {'name': 'Unknown', 'symbol': 'UNKNOWN', 'description': ''}
         
         try:
-            async with httpx.AsyncClient() as client:
-                # Method 1: Helius DAS API (most reliable for new tokens)
-                try:
-                    response = await client.post(
-                        self.helius_url,
-                        json={
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "getAsset",
-                            "params": {"id": mint_address}
-                        },
-                        timeout=10.0
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        result = data.get('result', {})
-                        content = result.get('content', {})
-                        meta = content.get('metadata', {})
-                        
-                        if meta.get('symbol'):  # We got valid metadata
-                            return {
-                                'name': meta.get('name', 'Unknown'),
-                                'symbol': meta.get('symbol', 'UNKNOWN'),
-                                'description': meta.get('description', ''),
-                                'image': content.get('links', {}).get('image', '')
-                            }
-                except:
-                    pass
-                
-                # Method 2: Try Pump.fun API directly (if it's a pump token)
-                try:
-                    response = await client.get(
-                        f"https://frontend-api.pump.fun/coins/{mint_address}",
-                        headers={
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                            'Accept': 'application/json'
-                        },
-                        timeout=10.0
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get('symbol'):
-                            return {
-                                'name': data.get('name', 'Unknown'),
-                                'symbol': data.get('symbol', 'UNKNOWN'),
-                                'description': data.get('description', ''),
-                                'market_cap': data.get('usd_market_cap', 0)
-                            }
-                except:
-                    pass
-                
-                # Method 3: Wait a bit and retry (new tokens need time to propagate)
-                await asyncio.sleep(2)
-                
-                # Retry Method 1 after delay
+            client = await self._client()
+            
+            # Method 1: Helius DAS API (most reliable for new tokens)
+            try:
                 response = await client.post(
                     self.helius_url,
                     json={
@@ -542,33 +790,82 @@ class WalletScanner:
                     },
                     timeout=10.0
                 )
-                
+
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     result = data.get('result', {})
                     content = result.get('content', {})
                     meta = content.get('metadata', {})
-                    
-                    if meta.get('symbol'):
-                        metadata = {
+
+                    if meta.get('symbol'):  # We got valid metadata
+                        return {
                             'name': meta.get('name', 'Unknown'),
                             'symbol': meta.get('symbol', 'UNKNOWN'),
-                            'description': meta.get('description', '')
+                            'description': meta.get('description', ''),
+                            'image': content.get('links', {}).get('image', '')
                         }
-                        
+            except:
+                pass
+
+            # Method 2: Try Pump.fun API directly (if it's a pump token)
+            try:
+                response = await client.get(
+                    f"https://frontend-api.pump.fun/coins/{mint_address}",
+                    headers={
+                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                        'Accept': 'application/json'
+                    },
+                    timeout=10.0
+                )
+
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    if data.get('symbol'):
+                        return {
+                            'name': data.get('name', 'Unknown'),
+                            'symbol': data.get('symbol', 'UNKNOWN'),
+                            'description': data.get('description', ''),
+                            'market_cap': data.get('usd_market_cap', 0)
+                        }
+            except:
+                pass
+
+            # Method 3: Wait a bit and retry (new tokens need time to propagate)
+            await asyncio.sleep(2)
+
+            # Retry Method 1 after delay
+            response = await client.post(
+                self.helius_url,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "getAsset",
+                    "params": {"id": mint_address}
+                },
+                timeout=10.0
+            )
+
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                result = data.get('result', {})
+                content = result.get('content', {})
+                meta = content.get('metadata', {})
+
+                if meta.get('symbol'):
+                    metadata = {
+                        'name': meta.get('name', 'Unknown'),
+                        'symbol': meta.get('symbol', 'UNKNOWN'),
+                        'description': meta.get('description', '')
+                    }
+
         except Exception as e:
-            print(f"Error fetching metadata for {mint_address}: {e}")
+            logger.error("Error fetching metadata for {}: {}", mint_address, e)
         
         # If we still don't have metadata, mark it for retry
         if metadata['symbol'] == 'UNKNOWN':
-            print(f"   ⚠️ Could not fetch metadata for {mint_address} - will retry later")
+            logger.warning("Could not fetch metadata for {} - will retry later", mint_address)
             # Store in a retry queue
-            async with self.db.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO metadata_retry_queue (mint_address, retry_count, next_retry)
-                    VALUES ($1, 0, NOW() + INTERVAL '1 minute')
-                    ON CONFLICT (mint_address) DO NOTHING
-                """, mint_address)
+            await self._queue_metadata_retry(mint_address)
         
         return metadata
 
@@ -576,6 +873,8 @@ class WalletScanner:
         """Background task to retry failed metadata fetches"""
         while True:
             try:
+                await self._flush_pending_retries()
+                
                 async with self.db.acquire() as conn:
                     # Get tokens that need metadata retry
                     tokens = await conn.fetch("""
@@ -583,38 +882,56 @@ class WalletScanner:
                         WHERE next_retry < NOW() AND retry_count < 5
                         LIMIT 10
                     """)
-                    
-                    for token in tokens:
-                        metadata = await self.fetch_token_metadata(token['mint_address'])
-                        
-                        if metadata['symbol'] != 'UNKNOWN':
-                            # Success! Update the token_launches table
-                            await conn.execute("""
-                                UPDATE anubis.token_launches 
-                                SET token_name = $1, token_symbol = $2
-                                WHERE mint_address = $3
-                            """, metadata['name'], metadata['symbol'], token['mint_address'])
-                            
-                            # Remove from retry queue
-                            await conn.execute("""
-                                DELETE FROM metadata_retry_queue 
-                                WHERE mint_address = $1
-                            """, token['mint_address'])
+                
+                # Fetch all metadata concurrently, at most 10 at a time
+                sem = asyncio.Semaphore(10)
+                
+                async def fetch(mint_address):
+                    async with sem:
+                        return await self.fetch_token_metadata(mint_address)
+                
+                mints = [token['mint_address'] for token in tokens]
+                results = await asyncio.gather(*(fetch(mint) for mint in mints))
+                
+                updated = []
+                failed = []
+                for mint, metadata in zip(mints, results):
+                    if metadata['symbol'] != 'UNKNOWN':
+                        updated.append((metadata['name'], metadata['symbol'], mint))
+                        logger.info("✅ Metadata updated: ${} - {}", metadata['symbol'], metadata['name'])
+                    else:
+                        failed.append((mint,))
+                
+                if updated or failed:
+                    async with self.db.acquire() as conn:
+                        async with conn.transaction():
+                            if updated:
+                                # Success! Update the token_launches table
+                                await conn.executemany("""
+                                    UPDATE anubis.token_launches 
+                                    SET token_name = $1, token_symbol = $2
+                                    WHERE mint_address = $3
+                                """, updated)
+                                
+                                # Remove from retry queue
+                                await conn.executemany("""
+                                    DELETE FROM metadata_retry_queue 
+                                    WHERE mint_address = $1
+                                """, [(mint,) for _, _, mint in updated])
                             
-                            print(f"   ✅ Metadata updated: ${metadata['symbol']} - {metadata['name']}")
-                        else:
-                            # Still failed, increment retry count
-                            await conn.execute("""
-                                UPDATE metadata_retry_queue 
-                                SET retry_count = retry_count + 1,
-                                    next_retry = NOW() + INTERVAL '5 minutes'
-                                WHERE mint_address = $1
-                            """, token['mint_address'])
+                            if failed:
+                                # Still failed, increment retry count
+                                await conn.executemany("""
+                                    UPDATE metadata_retry_queue 
+                                    SET retry_count = retry_count + 1,
+                                        next_retry = NOW() + INTERVAL '5 minutes'
+                                    WHERE mint_address = $1
+                                """, failed)
                 
                 await asyncio.sleep(60)  # Check every minute
                 
             except Exception as e:
-                print(f"Error in metadata retry: {e}")
+                logger.error("Error in metadata retry: {}", e)
                 await asyncio.sleep(60)
 
     # ============= HISTORICAL SCANNING =============
@@ -624,13 +941,29 @@ class WalletScanner:
         Scan historical data for both platforms
         This is called once to populate the database with past data
         """
+        all_results = {}
+        async for platform_name, platform_results in self._scan_platforms(start_date, end_date):
+            all_results[platform_name] = platform_results
+        
+        return all_results
+
+    async def iter_historical_scan(self, start_date: datetime,
+                                   end_date: datetime) -> AsyncIterator[Tuple[str, int]]:
+        """
+        Scan historical data for both platforms, yielding (platform, launches found)
+        as each platform is stored - no platform's launches outlive its own step
+        """
+        async for platform_name, platform_results in self._scan_platforms(start_date, end_date):
+            yield platform_name, len(platform_results)
+
+    async def _scan_platforms(self, start_date: datetime,
+                              end_date: datetime) -> AsyncIterator[Tuple[str, List[LaunchInfo]]]:
+        """Scan, store and profile each platform in turn, yielding its launches"""
         self.scan_status["running"] = True
         self.scan_status["progress"] = 0
         
         logger.info(f"Starting historical scan from {start_date} to {end_date}")
         
-        all_results = {}
-        
         try:
             for platform_name, program_id in self.programs.items():
                 logger.info(f"Scanning {platform_name}...")
@@ -642,101 +975,329 @@ class WalletScanner:
                     end_date
                 )
                 
-                all_results[platform_name] = platform_results
-                
                 # Store results as we go
                 await self._store_historical_results(platform_name, platform_results)
                 
                 # Update developer profiles
                 await self._update_developer_profiles(platform_results)
                 
+                yield platform_name, platform_results
+                del platform_results  # don't hold it through the next platform's scan
+                
         except Exception as e:
             logger.error(f"Historical scan error: {e}")
             raise
         finally:
             self.scan_status["running"] = False
-            
-        return all_results
 
     async def _scan_platform_history(self, program_id: str, platform: str, 
-                                    start_date: datetime, end_date: datetime) -> List[Dict]:
+                                    start_date: datetime, end_date: datetime) -> List[LaunchInfo]:
         """Scan a specific platform's history using Helius RPC"""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            all_launches = []
-            before_signature = None
+        # Checkpoints and launch times are naive local time - callers may pass
+        # aware datetimes (e.g. last_scan_date from a TIMESTAMPTZ column)
+        start_date = _to_naive_local(start_date)
+        end_date = _to_naive_local(end_date)
+        
+        client = await self._client()
+        all_launches = []
+        before_signature = None
+        
+        # If an earlier scan already covered start_date onwards, only walk back to
+        # its newest signature
+        until_signature = None
+        scanned_from = start_date
+        checkpoint = await self._load_scan_checkpoint(program_id)
+        if (checkpoint and checkpoint['scanned_from'] <= start_date
+                and checkpoint['last_block_time'] <= end_date):
+            until_signature = checkpoint['last_sig']
+            scanned_from = checkpoint['scanned_from']
+            logger.info(f"{platform}: resuming from checkpoint at {checkpoint['last_block_time']}")
+        
+        newest = None  # (signature, date) of the newest in-range signature seen
+        complete = False  # only a walk that reached its end may move the checkpoint
+        failures = 0
+        
+        # blockTime is a Unix timestamp - compare it as an int, and only build
+        # datetimes for signatures inside the range
+        start_ts = int(start_date.timestamp())
+        end_ts = int(end_date.timestamp())
+        
+        while True:
+            # Get signatures for the program
+            options = {
+                "limit": 1000,
+                "before": before_signature,
+                "commitment": "confirmed"
+            }
+            if until_signature:
+                options["until"] = until_signature
             
-            while True:
-                # Get signatures for the program
-                payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getSignaturesForAddress",
-                    "params": [
-                        program_id,
-                        {
-                            "limit": 1000,
-                            "before": before_signature,
-                            "commitment": "confirmed"
-                        }
-                    ]
-                }
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getSignaturesForAddress",
+                "params": [program_id, options]
+            }
+            
+            try:
+                response = await self._post_rpc(client, payload)
+                data = orjson.loads(response.content)
                 
-                try:
-                    response = await client.post(self.helius_url, json=payload)
-                    data = response.json()
+                if "result" not in data:
+                    raise RuntimeError(
+                        f"getSignaturesForAddress failed: {data.get('error', response.status_code)}"
+                    )
+                
+                signatures = data["result"]
+                if not signatures:
+                    complete = True  # walked past the oldest signature
+                    break
+                failures = 0
+                
+                # Collect the page's signatures that fall inside the date range
+                in_range = []
+                reached_start = False
+                for sig_info in signatures:
+                    block_time = sig_info.get("blockTime") or 0
+                    if block_time == 0:
+                        continue
                     
-                    if "result" not in data or not data["result"]:
+                    # Check date range
+                    if block_time < start_ts:
+                        reached_start = True  # We've gone too far back
                         break
                     
-                    signatures = data["result"]
-                    
-                    for sig_info in signatures:
-                        block_time = sig_info.get("blockTime", 0)
-                        if block_time == 0:
-                            continue
-                        
-                        sig_date = datetime.fromtimestamp(block_time)
-                        
-                        # Check date range
-                        if sig_date < start_date:
-                            return all_launches  # We've gone too far back
-                        
-                        if sig_date > end_date:
-                            continue
-                        
-                        # Get and parse the transaction
-                        tx_data = await self._get_transaction(client, sig_info["signature"])
-                        
-                        if tx_data:
-                            launch_info = await self._parse_launch_transaction(
-                                tx_data, 
-                                platform, 
-                                sig_date
-                            )
-                            
-                            if launch_info:
-                                all_launches.append(launch_info)
-                                
-                                # Update progress
-                                self.scan_status["progress"] += 1
-                                
-                                if len(all_launches) % 100 == 0:
-                                    logger.info(f"{platform}: Found {len(all_launches)} launches")
-                    
-                    # Pagination
-                    before_signature = signatures[-1]["signature"]
+                    if block_time > end_ts:
+                        continue
                     
-                    # Rate limiting
-                    await asyncio.sleep(0.1)
+                    in_range.append((sig_info["signature"], datetime.fromtimestamp(block_time)))
+                
+                if newest is None and in_range:
+                    newest = in_range[0]
+                
+                # Get the page's transactions with batched RPC calls, then parse them
+                transactions = await self._get_transactions_batched(
+                    client, [sig for sig, _ in in_range]
+                )
+                
+                # The checkpoint may only pass signatures that were actually fetched -
+                # retry the page if any are missing
+                missing = sum(1 for sig, _ in in_range if sig not in transactions)
+                if missing:
+                    raise RuntimeError(f"{missing} transactions in the page were not fetched")
+                
+                for sig, sig_date in in_range:
+                    tx_data = transactions.get(sig)
+                    if not tx_data:
+                        continue
                     
-                except Exception as e:
-                    logger.error(f"Error scanning {platform}: {e}")
-                    await asyncio.sleep(1)  # Back off on error
+                    launch_info = await self._parse_launch_transaction(tx_data, platform, sig_date)
                     
-            return all_launches
+                    if launch_info:
+                        all_launches.append(launch_info)
+                        
+                        # Update progress
+                        self.scan_status["progress"] += 1
+                        
+                        if len(all_launches) % 100 == 0:
+                            logger.info(f"{platform}: Found {len(all_launches)} launches")
+                
+                if reached_start:
+                    complete = True
+                    break
+                
+                # Pagination
+                before_signature = signatures[-1]["signature"]
+                
+                # Rate limiting
+                await asyncio.sleep(0.1)
+                
+            except Exception as e:
+                failures += 1
+                if failures > SCAN_PAGE_MAX_RETRIES:
+                    logger.error(f"{platform}: giving up after {failures} failed pages: {e}")
+                    break
+                
+                # Back off, then retry the same page
+                logger.error(f"Error scanning {platform}: {e}")
+                await asyncio.sleep(min(30, 2 ** failures))
+        
+        # Everything from scanned_from up to the newest signature is now covered -
+        # an interrupted walk leaves the old checkpoint so the gap is rescanned
+        if not complete:
+            logger.warning(f"{platform}: scan did not reach {start_date}, checkpoint not updated")
+        elif newest:
+            await self._save_scan_checkpoint(program_id, newest[0], newest[1], scanned_from)
+                
+        return all_launches
+
+    async def _post_rpc(self, client: httpx.AsyncClient, payload, timeout: float = 30.0,
+                        retries: int = RPC_MAX_RETRIES) -> httpx.Response:
+        """
+        POST a JSON-RPC request, backing off and retrying while Helius rate limits (429)
+        At most _fetch_sem requests are in flight; the slot is released while backing off
+        """
+        delay = 0.5
+        for attempt in range(retries):
+            async with self._fetch_sem:
+                response = await client.post(
+                    self.helius_url,
+                    content=orjson.dumps(payload),
+                    headers={"Content-Type": "application/json"},
+                    timeout=timeout
+                )
+            if response.status_code != 429 or attempt == retries - 1:
+                return response
+            
+            # Honour Retry-After when given, otherwise exponential backoff with jitter
+            await asyncio.sleep(_retry_wait(response, delay))
+            delay = min(30, delay * 2)
+        
+        return response
+
+    async def _load_scan_checkpoint(self, program_id: str) -> Optional[asyncpg.Record]:
+        """Get the newest signature a completed scan covered for a program"""
+        try:
+            async with self.db.acquire() as conn:
+                return await conn.fetchrow("""
+                    SELECT last_sig, last_block_time, scanned_from
+                    FROM scan_checkpoints WHERE program_id = $1
+                """, program_id)
+        except Exception as e:
+            logger.warning(f"Could not load scan checkpoint for {program_id}: {e}")
+            return None
+
+    async def _save_scan_checkpoint(self, program_id: str, last_sig: str,
+                                    last_block_time: datetime, scanned_from: datetime):
+        """Record the newest signature a completed scan covered for a program"""
+        try:
+            async with self.db.acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO scan_checkpoints
+                    (program_id, last_sig, last_block_time, scanned_from, updated_at)
+                    VALUES ($1, $2, $3, $4, NOW())
+                    ON CONFLICT (program_id) DO UPDATE SET
+                        last_sig = EXCLUDED.last_sig,
+                        last_block_time = EXCLUDED.last_block_time,
+                        scanned_from = EXCLUDED.scanned_from,
+                        updated_at = NOW()
+                """, program_id, last_sig, last_block_time, scanned_from)
+        except Exception as e:
+            logger.warning(f"Could not save scan checkpoint for {program_id}: {e}")
+
+    async def _get_transactions_batched(self, client: httpx.AsyncClient,
+                                        signatures: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch transactions in JSON-RPC batches of rpc_batch_size, batches run concurrently"""
+        chunks = [
+            signatures[i:i + self.rpc_batch_size]
+            for i in range(0, len(signatures), self.rpc_batch_size)
+        ]
+        
+        transactions = {}
+        for batch in await asyncio.gather(
+            *(self._get_transactions_batch(client, chunk) for chunk in chunks)
+        ):
+            transactions.update(batch)
+        
+        return transactions
+
+    async def _get_transactions_batch(self, client: httpx.AsyncClient,
+                                      signatures: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch several transactions from Helius in a single JSON-RPC batch request"""
+        if not signatures:
+            return {}
+        
+        if not self._batch_rpc:
+            return await self._get_transactions_concurrent(client, signatures)
+        
+        transactions = {}
+        pending = signatures  # signatures not fetched yet
+        delay = 0.5
+        for attempt in range(RPC_MAX_RETRIES):
+            payload = [
+                {
+                    "jsonrpc": "2.0",
+                    "id": i,
+                    "method": "getTransaction",
+                    "params": [
+                        signature,
+                        {
+                            "encoding": "jsonParsed",
+                            "commitment": "confirmed",
+                            "maxSupportedTransactionVersion": 0
+                        }
+                    ]
+                }
+                for i, signature in enumerate(pending)
+            ]
+            
+            # One POST per attempt - this loop is the only retry layer for batches
+            response = None
+            try:
+                response = await self._post_rpc(client, payload, retries=1)
+                try:
+                    data = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    data = f"HTTP {response.status_code}"  # e.g. a plain-text 429
+            except Exception as e:
+                logger.error(f"Error getting {len(pending)} transactions: {e}")
+                data = None
+            
+            if isinstance(data, list):
+                # Responses may arrive in any order - match them back by id. Items
+                # carrying an error (e.g. a per-item 429) or missing from the reply
+                # weren't fetched and are retried
+                failed = set(pending)
+                for item in data:
+                    index = item.get("id")
+                    if not isinstance(index, int) or not 0 <= index < len(pending) or "error" in item:
+                        continue
+                    transactions[pending[index]] = _slim_transaction(item.get("result"))
+                    failed.discard(pending[index])
+                
+                if not failed:
+                    return transactions
+                
+                pending = [sig for sig in pending if sig in failed]
+                data = f"{len(pending)} items failed"
+            
+            elif _is_batch_rejection(data):
+                # Endpoint doesn't accept batches - use single calls from now on
+                logger.warning(f"Batch getTransaction rejected, falling back to single calls: {data}")
+                self._batch_rpc = False
+                transactions.update(await self._get_transactions_concurrent(client, pending))
+                return transactions
+            
+            # Rate limited or a transient error - back off and retry the whole batch
+            # rather than fanning out to single calls
+            if attempt < RPC_MAX_RETRIES - 1:
+                logger.warning(f"Batch getTransaction failed, retrying: {data}")
+                await asyncio.sleep(_retry_wait(response, delay))
+                delay = min(30, delay * 2)
+        
+        # Let the caller retry the page rather than treating these as missing
+        raise RuntimeError(f"Batch getTransaction for {len(pending)} signatures failed "
+                           f"after {RPC_MAX_RETRIES} attempts")
+
+    async def _get_transactions_concurrent(self, client: httpx.AsyncClient,
+                                           signatures: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch transactions with single calls, at most _fetch_sem in flight"""
+        results = await asyncio.gather(
+            *(self._get_transaction(client, sig) for sig in signatures),
+            return_exceptions=True
+        )
+        
+        # A failed fetch must not read as "no transaction" - let the page retry
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return dict(zip(signatures, results))
 
     async def _get_transaction(self, client: httpx.AsyncClient, signature: str) -> Optional[Dict]:
-        """Fetch full transaction data from Helius"""
+        """
+        Fetch full transaction data from Helius
+        Returns None only when the transaction doesn't exist; request errors raise
+        """
         payload = {
             "jsonrpc": "2.0",
             "id": 1,
@@ -745,63 +1306,53 @@ class WalletScanner:
                 signature,
                 {
                     "encoding": "jsonParsed",
+                    "commitment": "confirmed",
                     "maxSupportedTransactionVersion": 0
                 }
             ]
         }
         
-        try:
-            response = await client.post(self.helius_url, json=payload)
-            data = response.json()
-            return data.get("result")
-        except Exception as e:
-            logger.error(f"Error getting transaction {signature}: {e}")
-            return None
+        response = await self._post_rpc(client, payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"getTransaction {signature} failed: HTTP {response.status_code}")
+        
+        data = orjson.loads(response.content)
+        if "error" in data:
+            raise RuntimeError(f"getTransaction {signature} failed: {data['error']}")
+        return _slim_transaction(data.get("result"))
 
     async def _parse_launch_transaction(self, tx_data: Dict, platform: str, 
-                                       timestamp: datetime) -> Optional[Dict]:
+                                       timestamp: datetime) -> Optional[LaunchInfo]:
         """Parse transaction to extract token launch information"""
         try:
             if not tx_data or "meta" not in tx_data:
                 return None
             
-            # Check if this is actually a token launch
-            if not self._is_token_launch(tx_data, platform):
+            # Check if this is actually a token launch - the logs or a mint
+            # initialization; the mint is found in the same single pass
+            mint_address = self._find_initialized_mint(tx_data)
+            if mint_address is None and not self._has_launch_logs(tx_data, platform):
                 return None
             
-            launch_info = {
-                "signature": tx_data["transaction"]["signatures"][0],
-                "platform": platform,
-                "launch_time": timestamp,
-                "creator_wallet": None,
-                "mint_address": None,
-                "token_name": None,
-                "token_symbol": None,
-                "initial_liquidity_sol": 0,
-                "metadata": {}
-            }
+            launch_info = LaunchInfo(
+                signature=tx_data["transaction"]["signatures"][0],
+                platform=platform,
+                launch_time=timestamp,
+                mint_address=mint_address
+            )
             
             # Get creator (fee payer is usually the creator)
             account_keys = tx_data["transaction"]["message"]["accountKeys"]
             if account_keys:
-                launch_info["creator_wallet"] = account_keys[0]["pubkey"]
-            
-            # Extract mint address and token info
-            inner_instructions = tx_data["meta"].get("innerInstructions", [])
-            for inner in inner_instructions:
-                for instruction in inner.get("instructions", []):
-                    if instruction.get("program") == "spl-token":
-                        parsed = instruction.get("parsed", {})
-                        if parsed.get("type") == "initializeMint":
-                            launch_info["mint_address"] = parsed["info"]["mint"]
+                launch_info.creator_wallet = account_keys[0]["pubkey"]
             
-            # Calculate SOL spent (initial liquidity)
-            pre_balances = tx_data["meta"]["preBalances"]
-            post_balances = tx_data["meta"]["postBalances"]
-            
-            if pre_balances and post_balances and len(pre_balances) > 0:
-                sol_spent = (pre_balances[0] - post_balances[0]) / 1e9
-                launch_info["initial_liquidity_sol"] = max(0, sol_spent)
+            # Calculate SOL spent (initial liquidity) - only the fee payer's balance matters
+            meta = tx_data["meta"]
+            try:
+                sol_spent = (meta["preBalances"][0] - meta["postBalances"][0]) / 1e9
+                launch_info.initial_liquidity_sol = sol_spent if sol_spent > 0 else 0.0
+            except (IndexError, KeyError):
+                pass
             
             return launch_info
             
@@ -811,144 +1362,288 @@ class WalletScanner:
 
     def _is_token_launch(self, tx_data: Dict, platform: str) -> bool:
         """Determine if a transaction is a token launch"""
-        # Check log messages for launch indicators
-        logs = tx_data["meta"].get("logMessages", [])
+        return (self._has_launch_logs(tx_data, platform)
+                or self._find_initialized_mint(tx_data) is not None)
+
+    @staticmethod
+    def _has_launch_logs(tx_data: Dict, platform: str) -> bool:
+        """Check log messages for the platform's launch indicators in one pass"""
+        launch_re = _PLATFORM_LAUNCH_RE.get(platform)
+        if launch_re is None:
+            return False
         
-        if platform == "pump_fun":
-            for log in logs:
-                if "Program log: Instruction: Create" in log:
-                    return True
-                if "create" in log.lower() and "token" in log.lower():
-                    return True
-                    
-        elif platform == "raydium_launchlab":
-            for log in logs:
-                if "initialize" in log.lower():
-                    return True
-        
-        # Check for mint initialization
-        inner_instructions = tx_data["meta"].get("innerInstructions", [])
-        for inner in inner_instructions:
+        logs = tx_data["meta"].get("logMessages", [])
+        return launch_re.search("\n".join(logs)) is not None
+
+    @staticmethod
+    def _find_initialized_mint(tx_data: Dict) -> Optional[str]:
+        """Mint initialized by the transaction's inner spl-token instructions, if any"""
+        mint_address = None
+        for inner in tx_data["meta"].get("innerInstructions", []):
             for instruction in inner.get("instructions", []):
                 if instruction.get("program") == "spl-token":
-                    if instruction.get("parsed", {}).get("type") == "initializeMint":
-                        return True
-        
-        return False
+                    parsed = instruction.get("parsed", {})
+                    if parsed.get("type") == "initializeMint":
+                        mint_address = parsed["info"]["mint"]
+        return mint_address
 
-    async def _store_historical_results(self, platform: str, results: List[Dict]):
+    async def _store_historical_results(self, platform: str, results: List[LaunchInfo]):
         """Store historical scan results in the database"""
         if not results:
             return
         
+        now = datetime.now()
+        
+        # Store in token_launches table
+        await self._bulk_store_launches(platform, results)
+        
+        # Look up market caps for every launch that could have succeeded in bulk,
+        # skipping the lookup for launches too small or too young to qualify
+        candidates = [
+            launch.mint_address
+            for launch in results
+            if launch.mint_address
+            and launch.initial_liquidity_sol >= MCAP_CHECK_MIN_LIQUIDITY_SOL
+            and (now - launch.launch_time).total_seconds() >= MCAP_CHECK_MIN_AGE_SECS
+        ]
+        market_caps = await self._get_market_caps_bulk(candidates)
+        
         async with self.db.acquire() as conn:
+            # Parsed and planned once for this connection, bound per successful token
+            success_stmt = await conn.prepare("""
+                INSERT INTO anubis.successful_tokens
+                (mint_address, creator_wallet, platform, launch_date, peak_mcap)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (mint_address) DO UPDATE SET
+                    peak_mcap = GREATEST(anubis.successful_tokens.peak_mcap, $5)
+            """)
+            
             for launch in results:
                 try:
-                    # Store in token_launches table
-                    await conn.execute("""
-                        INSERT INTO anubis.token_launches 
-                        (mint_address, creator, platform, created_at, 
-                         initial_liquidity, signature, metadata)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7)
-                        ON CONFLICT (mint_address) DO UPDATE SET
-                            platform = EXCLUDED.platform,
-                            created_at = EXCLUDED.created_at
-                    """,
-                        launch.get("mint_address"),
-                        launch.get("creator_wallet"),
-                        platform,
-                        launch.get("launch_time"),
-                        launch.get("initial_liquidity_sol", 0),
-                        launch.get("signature"),
-                        json.dumps(launch.get("metadata", {}))
-                    )
-                    
                     # Check if this token was successful (>$100K market cap)
-                    market_cap = await self._get_token_market_cap(launch.get("mint_address"))
+                    market_cap = market_caps.get(launch.mint_address)
                     
                     if market_cap and market_cap > 100000:
-                        await conn.execute("""
-                            INSERT INTO anubis.successful_tokens
-                            (mint_address, creator_wallet, platform, launch_date, peak_mcap)
-                            VALUES ($1, $2, $3, $4, $5)
-                            ON CONFLICT (mint_address) DO UPDATE SET
-                                peak_mcap = GREATEST(anubis.successful_tokens.peak_mcap, $5)
-                        """,
-                            launch.get("mint_address"),
-                            launch.get("creator_wallet"),
+                        await success_stmt.fetch(
+                            launch.mint_address,
+                            launch.creator_wallet,
                             platform,
-                            launch.get("launch_time"),
+                            launch.launch_time,
                             market_cap
                         )
 
-                    if launch.get("creator_wallet") and self.scoring_engine:
+                    if launch.creator_wallet and self.scoring_engine:
                         try:
                             await self.scoring_engine.calculate_anubis_score(
-                                launch.get("creator_wallet")
+                                launch.creator_wallet
                             )
                         except Exception as e:
                             logger.error(f"Error calculating Anubis score: {e}")
                 
-                except Exception as e:
-                    print(f"Error in token processing: {e}")
+                except Exception:
+                    logger.exception("Error in token processing")
                     continue
 
-    async def _update_developer_profiles(self, launches: List[Dict]):
+    async def _bulk_store_launches(self, platform: str, results: List[LaunchInfo]):
+        """COPY launches into a staging table and merge them into token_launches"""
+        # Launches without a mint can't be keyed - nothing downstream can use them
+        records = [
+            (
+                launch.mint_address,
+                launch.creator_wallet,
+                platform,
+                launch.launch_time,
+                launch.initial_liquidity_sol,
+                launch.signature,
+                launch.metadata
+            )
+            for launch in results
+            if launch.mint_address
+        ]
+        columns = ["mint_address", "creator", "platform", "created_at",
+                   "initial_liquidity", "signature", "metadata"]
+        
+        for i in range(0, len(records), HISTORICAL_COPY_CHUNK):
+            chunk = records[i:i + HISTORICAL_COPY_CHUNK]
+            try:
+                async with self.db.acquire() as conn:
+                    async with conn.transaction():
+                        # Only the staged fields - no id sequence or NOT NULL columns to trip over
+                        await conn.execute("""
+                            CREATE TEMP TABLE _lt (
+                                mint_address TEXT,
+                                creator TEXT,
+                                platform TEXT,
+                                created_at TIMESTAMP,
+                                initial_liquidity DOUBLE PRECISION,
+                                signature TEXT,
+                                metadata JSONB
+                            ) ON COMMIT DROP
+                        """)
+                        await conn.copy_records_to_table('_lt', records=chunk, columns=columns)
+                        
+                        # A mint can only be merged once per statement - keep its latest launch
+                        await conn.execute("""
+                            INSERT INTO anubis.token_launches 
+                            (mint_address, creator, platform, created_at, 
+                             initial_liquidity, signature, metadata)
+                            SELECT DISTINCT ON (mint_address)
+                                mint_address, creator, platform, created_at,
+                                initial_liquidity, signature, metadata
+                            FROM _lt
+                            ORDER BY mint_address, created_at DESC
+                            ON CONFLICT (mint_address) DO UPDATE SET
+                                platform = EXCLUDED.platform,
+                                created_at = EXCLUDED.created_at
+                        """)
+            except Exception:
+                logger.exception(f"Error storing {len(chunk)} {platform} launches")
+
+    async def _update_developer_profiles(self, launches: List[LaunchInfo]):
         """Update developer wallet profiles based on launch history"""
-        # Group launches by creator
-        creators = {}
-        for launch in launches:
-            creator = launch.get("creator_wallet")
-            if creator:
-                if creator not in creators:
-                    creators[creator] = []
-                creators[creator].append(launch)
+        # Aggregation is CPU-bound, keep it off the event loop
+        rows = await asyncio.to_thread(self._aggregate_creators, launches)
+        if not rows:
+            return
         
-        async with self.db.acquire() as conn:
-            for wallet, wallet_launches in creators.items():
-                try:
-                    # Calculate metrics
-                    total_launches = len(wallet_launches)
-                    avg_liquidity = sum(l.get("initial_liquidity_sol", 0) 
-                                      for l in wallet_launches) / total_launches
-                    
-                    # Update or create profile
+        try:
+            async with self.db.acquire() as conn:
+                async with conn.transaction():
+                    # Stage the aggregates with COPY, then update or create all
+                    # profiles in a single statement
+                    await conn.execute("""
+                        CREATE TEMP TABLE _wp_stage (
+                            wallet_address TEXT,
+                            new_launches INTEGER,
+                            avg_seed DOUBLE PRECISION,
+                            first_seen TIMESTAMP,
+                            last_active TIMESTAMP
+                        ) ON COMMIT DROP
+                    """)
+                    await conn.copy_records_to_table('_wp_stage', records=rows)
                     await conn.execute("""
                         INSERT INTO anubis.wallet_profiles
                         (wallet_address, total_launches, avg_seed_amount, 
                          first_seen, last_active)
-                        VALUES ($1, $2, $3, $4, $5)
+                        SELECT wallet_address, new_launches, avg_seed, first_seen, last_active
+                        FROM _wp_stage
                         ON CONFLICT (wallet_address) DO UPDATE SET
-                            total_launches = anubis.wallet_profiles.total_launches + $2,
-                            avg_seed_amount = $3,
-                            last_active = $5
-                    """,
-                        wallet,
-                        total_launches,
-                        avg_liquidity,
-                        min(l["launch_time"] for l in wallet_launches),
-                        max(l["launch_time"] for l in wallet_launches)
-                    )
+                            total_launches = anubis.wallet_profiles.total_launches + EXCLUDED.total_launches,
+                            avg_seed_amount = EXCLUDED.avg_seed_amount,
+                            last_active = EXCLUDED.last_active
+                    """)
+            
+            for row in rows:
+                self._profile_cache.pop(row[0], None)
                     
-                except Exception as e:
-                    logger.error(f"Error updating profile for {wallet}: {e}")
+        except Exception as e:
+            logger.error(f"Error updating {len(rows)} developer profiles: {e}")
+
+    @staticmethod
+    def _aggregate_creators(launches: List[LaunchInfo]) -> List[tuple]:
+        """Aggregate launch metrics per creator in one vectorized groupby"""
+        if not launches:
+            return []
+        
+        df = pd.DataFrame(
+            [(launch.creator_wallet, launch.initial_liquidity_sol, launch.launch_time)
+             for launch in launches],
+            columns=["creator_wallet", "initial_liquidity_sol", "launch_time"]
+        )
+        df = df[df["creator_wallet"].fillna("") != ""]
+        if df.empty:
+            return []
+        
+        df["initial_liquidity_sol"] = df["initial_liquidity_sol"].fillna(0).astype(float)
+        agg = df.groupby("creator_wallet", sort=False).agg(
+            total_launches=("creator_wallet", "size"),
+            avg_liquidity=("initial_liquidity_sol", "mean"),
+            first_seen=("launch_time", "min"),
+            last_active=("launch_time", "max")
+        )
+        
+        # asyncpg needs native Python types rather than NumPy/pandas scalars
+        return [
+            (wallet, int(total), float(avg_liquidity),
+             first_seen.to_pydatetime(), last_active.to_pydatetime())
+            for wallet, total, avg_liquidity, first_seen, last_active
+            in agg.itertuples(name=None)
+        ]
 
     async def _get_token_market_cap(self, mint_address: str) -> Optional[float]:
-        """Get current market cap for a token using Jupiter API"""
+        """Get current market cap for a token, cached per mint for the TTL window"""
         if not mint_address:
             return None
-            
+        
+        if mint_address in self._mcap_cache:
+            return self._mcap_cache[mint_address]
+        
+        # Concurrent callers for the same mint share one in-flight request
+        task = self._mcap_inflight.get(mint_address)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_token_market_cap(mint_address))
+            self._mcap_inflight[mint_address] = task
+            task.add_done_callback(lambda _: self._mcap_inflight.pop(mint_address, None))
+        
+        market_cap = await asyncio.shield(task)
+        self._mcap_cache[mint_address] = market_cap
+        return market_cap
+
+    async def _get_market_caps_bulk(self, mints: List[str]) -> Dict[str, float]:
+        """Get market caps for many tokens, JUPITER_BATCH_SIZE mints per Jupiter request"""
+        market_caps = {}
+        missing = []
+        for mint in dict.fromkeys(mints):
+            if mint in self._mcap_cache:
+                market_caps[mint] = self._mcap_cache[mint]
+            else:
+                missing.append(mint)
+        
+        chunks = [
+            missing[i:i + JUPITER_BATCH_SIZE]
+            for i in range(0, len(missing), JUPITER_BATCH_SIZE)
+        ]
+        for fetched in await asyncio.gather(*(self._fetch_market_caps(chunk) for chunk in chunks)):
+            market_caps.update(fetched)
+        
+        # Misses are cached too, so a rerun doesn't ask Jupiter again inside the TTL
+        for mint in missing:
+            self._mcap_cache[mint] = market_caps.get(mint)
+        
+        return market_caps
+
+    async def _fetch_market_caps(self, mints: List[str]) -> Dict[str, float]:
+        """Get market caps for up to JUPITER_BATCH_SIZE tokens in one Jupiter request"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Use Jupiter price API
-                url = f"https://price.jup.ag/v4/price?ids={mint_address}"
-                response = await client.get(url)
+            client = await self._client()
+            async with self._fetch_sem:
+                response = await client.get(f"https://price.jup.ag/v4/price?ids={','.join(mints)}")
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content).get("data", {})
+                return {
+                    mint: info.get("marketCap", 0)
+                    for mint, info in data.items()
+                }
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if mint_address in data.get("data", {}):
-                        return data["data"][mint_address].get("marketCap", 0)
-                        
+        except Exception as e:
+            logger.debug(f"Could not get market caps for {len(mints)} tokens: {e}")
+            
+        return {}
+
+    async def _fetch_token_market_cap(self, mint_address: str) -> Optional[float]:
+        """Get current market cap for a token using Jupiter API"""
+        try:
+            client = await self._client()
+            # Use Jupiter price API
+            url = f"https://price.jup.ag/v4/price?ids={mint_address}"
+            response = await client.get(url)
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                if mint_address in data.get("data", {}):
+                    return data["data"][mint_address].get("marketCap", 0)
+                    
         except Exception as e:
             logger.debug(f"Could not get market cap for {mint_address}: {e}")
             
@@ -960,182 +1655,286 @@ class WalletScanner:
         """Start real-time monitoring of both platforms"""
         logger.info("Starting real-time monitoring for Pump.fun and LaunchLab...")
         
-        # Run both monitors concurrently
-        await asyncio.gather(
-            self._monitor_pump_fun(),
-            self._monitor_launchlab(),
-            return_exceptions=True
-        )
+        await self._monitor_programs()
 
-    async def _monitor_pump_fun(self):
-        """Monitor Pump.fun launches in real-time via WebSocket"""
+    async def _monitor_programs(self, programs: Optional[Dict[str, str]] = None, handler=None):
+        """
+        Monitor every platform's program logs in real-time over one WebSocket
+        Each platform gets its own logsSubscribe on the shared connection
+        Notifications go to handler(value, platform), _process_realtime_launch by default
+        """
+        programs = programs or self.programs
+        handler = handler or self._process_realtime_launch
+        backoff = 1
+        
+        # The socket only decodes and enqueues; workers do the RPC and DB work
+        if not self._realtime_workers:
+            self._realtime_workers = [
+                asyncio.create_task(self._realtime_worker())
+                for _ in range(REALTIME_WORKERS)
+            ]
+            self._realtime_workers.append(asyncio.create_task(self._realtime_flusher()))
+            self._realtime_workers.append(asyncio.create_task(self._realtime_alert_worker()))
+        
         while True:
             try:
                 async with connect(self.helius_ws_url) as websocket:
-                    # Subscribe to Pump.fun program logs
-                    await websocket.send(json.dumps({
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "logsSubscribe",
-                        "params": [
-                            {"mentions": [self.programs["pump_fun"]]},
-                            {"commitment": "confirmed"}
-                        ]
-                    }))
+                    # Subscribe to each platform's program logs, keyed by request id
+                    request_platforms = {}
+                    for request_id, (platform, program_id) in enumerate(programs.items(), 1):
+                        request_platforms[request_id] = platform
+                        await websocket.send(orjson.dumps({
+                            "jsonrpc": "2.0",
+                            "id": request_id,
+                            "method": "logsSubscribe",
+                            "params": [
+                                {"mentions": [program_id]},
+                                {"commitment": self.ws_commitment}
+                            ]
+                        }).decode())
                     
-                    logger.info("Connected to Pump.fun WebSocket monitor")
+                    subscriptions = {}  # subscription id -> platform
                     
                     async for message in websocket:
+                        backoff = 1  # Connection is healthy again
+                        
                         try:
-                            data = json.loads(message)
+                            # Decode large frames off the event loop
+                            if len(message) > 32_768:
+                                data = await asyncio.to_thread(orjson.loads, message)
+                            else:
+                                data = orjson.loads(message)
                             
-                            if "params" in data and "result" in data["params"]:
-                                await self._process_realtime_launch(
-                                    data["params"]["result"],
-                                    "pump_fun"
-                                )
+                            # Subscription confirmation: {"id": <request id>, "result": <subscription id>}
+                            if data.get("id") in request_platforms:
+                                platform = request_platforms[data["id"]]
+                                subscriptions[data["result"]] = platform
+                                logger.info("Subscribed to {} WebSocket monitor", platform)
+                                continue
+                            
+                            params = data.get("params")
+                            if not params or "result" not in params:
+                                continue
+                            
+                            platform = subscriptions.get(params.get("subscription"))
+                            if platform:
+                                self._enqueue_realtime(handler, params["result"]["value"], platform)
                                 
                         except Exception as e:
-                            logger.error(f"Error processing Pump.fun message: {e}")
+                            logger.error("Error processing WebSocket message: {}", e)
                             
             except Exception as e:
-                logger.error(f"Pump.fun WebSocket error: {e}")
-                await asyncio.sleep(5)  # Reconnect after 5 seconds
+                # Exponential backoff with jitter to avoid reconnect storms
+                delay = backoff + random.uniform(0, backoff * 0.5)
+                logger.error(f"WebSocket error: {e} - reconnecting in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                backoff = min(60, backoff * 2)
+
+    def _enqueue_realtime(self, handler, value: Dict, platform: str):
+        """Queue a log notification for the workers, dropping the oldest when full"""
+        if self._realtime_q.full():
+            self._realtime_q.get_nowait()
+            self._realtime_q.task_done()
+            logger.warning("Realtime queue full - dropped oldest notification")
+        self._realtime_q.put_nowait((handler, value, platform))
 
-    async def _monitor_launchlab(self):
-        """Monitor Raydium LaunchLab (includes LetsBonk.fun) in real-time"""
+    async def _realtime_worker(self):
+        """Process queued log notifications"""
         while True:
+            handler, value, platform = await self._realtime_q.get()
             try:
-                async with connect(self.helius_ws_url) as websocket:
-                    # Subscribe to LaunchLab program logs
-                    await websocket.send(json.dumps({
-                        "jsonrpc": "2.0",
-                        "id": 2,
-                        "method": "logsSubscribe",
-                        "params": [
-                            {"mentions": [self.programs["raydium_launchlab"]]},
-                            {"commitment": "confirmed"}
-                        ]
-                    }))
-                    
-                    logger.info("Connected to LaunchLab WebSocket monitor")
-                    
-                    async for message in websocket:
-                        try:
-                            data = json.loads(message)
-                            
-                            if "params" in data and "result" in data["params"]:
-                                await self._process_realtime_launch(
-                                    data["params"]["result"],
-                                    "raydium_launchlab"
-                                )
-                                
-                        except Exception as e:
-                            logger.error(f"Error processing LaunchLab message: {e}")
-                            
+                await handler(value, platform)
             except Exception as e:
-                logger.error(f"LaunchLab WebSocket error: {e}")
-                await asyncio.sleep(5)  # Reconnect after 5 seconds
+                logger.error("Error processing {} notification: {}", platform, e)
+            finally:
+                self._realtime_q.task_done()
 
     async def _process_realtime_launch(self, log_result: Dict, platform: str):
         """Process a real-time token launch detection"""
         try:
+            # Failed transactions can't be launches - skip before any parsing or RPC
+            if log_result.get("err") is not None:
+                return
+            
             signature = log_result.get("signature")
             logs = log_result.get("logs", [])
             
             # Quick check if this might be a launch
-            is_launch = False
-            for log in logs:
-                if any(keyword in log.lower() for keyword in ["create", "initialize", "mint"]):
-                    is_launch = True
-                    break
+            is_launch = _LAUNCH_RE.search("\n".join(logs)) is not None
             
             if not is_launch:
                 return
             
             # Get full transaction details
-            async with httpx.AsyncClient() as client:
-                tx_data = await self._get_transaction(client, signature)
+            client = await self._client()
+            tx_data = await self._get_transaction(client, signature)
+            
+            if tx_data:
+                launch_info = await self._parse_launch_transaction(
+                    tx_data, 
+                    platform,
+                    datetime.now()
+                )
                 
-                if tx_data:
-                    launch_info = await self._parse_launch_transaction(
-                        tx_data, 
-                        platform,
-                        datetime.now()
-                    )
+                if launch_info:
+                    logger.info("{} New {} launch detected: {}", _EMOJI_LAUNCH, platform, launch_info.mint_address)
+                    
+                    # The developer alert check runs alongside the buffered store
+                    self._queue_realtime_alert(launch_info)
+                    await self._store_realtime_launch(launch_info)
                     
-                    if launch_info:
-                        logger.info(f"🚀 New {platform} launch detected: {launch_info['mint_address']}")
-                        
-                        # Store in database
-                        await self._store_realtime_launch(launch_info)
-                        
-                        # Check developer history for alerts
-                        await self.alert_system.process_new_launch(
-                            wallet=launch_info['creator_wallet'],
-                            token=launch_info['mint_address'],
-                            platform=platform
-                        )
-                        
         except Exception as e:
-            logger.error(f"Error processing realtime launch: {e}")
+            logger.error("Error processing realtime launch: {}", e)
 
-    async def _store_realtime_launch(self, launch_info: Dict):
-        """Store real-time launch in database and update rolling window"""
-        async with self.db.acquire() as conn:
-            # Store in main table
-            await conn.execute("""
-                INSERT INTO anubis.token_launches 
-                (mint_address, creator, platform, created_at, 
-                 initial_liquidity, signature, metadata)
-                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                ON CONFLICT (mint_address) DO NOTHING
-            """,
-                launch_info.get("mint_address"),
-                launch_info.get("creator_wallet"),
-                launch_info.get("platform"),
-                launch_info.get("launch_time"),
-                launch_info.get("initial_liquidity_sol", 0),
-                launch_info.get("signature"),
-                json.dumps(launch_info.get("metadata", {}))
-            )
+    async def _store_realtime_launch(self, launch_info: LaunchInfo):
+        """Buffer a real-time launch, flushing once REALTIME_FLUSH_ROWS are waiting"""
+        self._launch_buf.append(launch_info)
+        if len(self._launch_buf) >= REALTIME_FLUSH_ROWS:
+            await self._flush_realtime_launches()
+
+    async def _flush_realtime_launches(self):
+        """Write buffered real-time launches with the prepared statement"""
+        async with self._write_lock:
+            batch, self._launch_buf = self._launch_buf, []
+            if not batch:
+                return
             
-            # Add to active monitoring
-            await conn.execute("""
-                INSERT INTO anubis.active_monitoring
-                (wallet_address, token_address, platform, detected_at)
-                VALUES ($1, $2, $3, NOW())
-            """,
-                launch_info.get("creator_wallet"),
-                launch_info.get("mint_address"),
-                launch_info.get("platform")
-            )
+            # Launches without a mint can't be keyed - mint_address is NOT NULL
+            batch = [launch_info for launch_info in batch if launch_info.mint_address]
+            rows = [
+                (
+                    launch_info.mint_address,
+                    launch_info.creator_wallet,
+                    launch_info.platform,
+                    launch_info.launch_time,
+                    launch_info.initial_liquidity_sol,
+                    launch_info.signature,
+                    launch_info.metadata
+                )
+                for launch_info in batch
+            ]
+            if not rows:
+                return
+            
+            try:
+                try:
+                    await self._write_launch_rows(rows)
+                except (asyncpg.PostgresConnectionError, asyncpg.InterfaceError):
+                    # Connection went bad - recycle it and retry once on a fresh one
+                    await self._release_write_conn()
+                    await self._write_launch_rows(rows)
+            except BaseException:
+                # Keep the batch for the next flush rather than dropping it - also
+                # when the flusher is cancelled mid-write, so close() still stores it
+                self._launch_buf = (batch + self._launch_buf)[-REALTIME_BUFFER_MAX:]
+                raise
 
-    async def _check_developer_alerts(self, launch_info: Dict):
-        """Check if this developer triggers any alert conditions"""
-        creator = launch_info.get("creator_wallet")
-        if not creator:
-            return
+    async def _write_launch_rows(self, rows: List[tuple]):
+        """Write launch rows in one executemany, one by one if the batch is rejected"""
+        stmt = await self._get_launch_stmt()
+        try:
+            await stmt.executemany(rows)
+        except (asyncpg.PostgresConnectionError, asyncpg.InterfaceError):
+            raise
+        except asyncpg.PostgresError as e:
+            # executemany is all-or-nothing - a bad row should only lose itself
+            logger.warning("Batch of {} realtime launches rejected ({}) - writing them one by one", len(rows), e)
+            for row in rows:
+                try:
+                    await stmt.fetch(*row)
+                except (asyncpg.PostgresConnectionError, asyncpg.InterfaceError):
+                    raise
+                except asyncpg.PostgresError as e:
+                    logger.error("Dropped realtime launch {}: {}", row[0], e)
+
+    def _queue_realtime_alert(self, launch_info: LaunchInfo):
+        """Hand a detected launch to the alert worker without waiting on its store"""
+        try:
+            self._realtime_alert_q.put_nowait(launch_info)
+        except asyncio.QueueFull:
+            logger.warning("Realtime alert queue full - skipped alert for {}", launch_info.mint_address)
+
+    async def _realtime_flusher(self):
+        """Flush buffered real-time launches every REALTIME_FLUSH_SECS"""
+        while True:
+            await asyncio.sleep(REALTIME_FLUSH_SECS)
+            try:
+                await self._flush_realtime_launches()
+            except Exception as e:
+                logger.error("Error storing realtime launches: {}", e)
+
+    async def _realtime_alert_worker(self):
+        """Check developer history for each detected real-time launch"""
+        while True:
+            launch_info = await self._realtime_alert_q.get()
+            try:
+                await self.alert_system.process_new_launch(
+                    wallet=launch_info.creator_wallet,
+                    token=launch_info.mint_address,
+                    platform=launch_info.platform
+                )
+            except Exception as e:
+                logger.error("Error processing realtime alert: {}", e)
+            finally:
+                self._realtime_alert_q.task_done()
+
+    async def _get_launch_stmt(self) -> asyncpg.prepared_stmt.PreparedStatement:
+        """Prepare the realtime launch statement once on a dedicated pool connection"""
+        if self._launch_stmt is None:
+            self._write_conn = await self.db.acquire()
+            try:
+                self._launch_stmt = await self._write_conn.prepare(self._REALTIME_LAUNCH_SQL)
+            except BaseException:
+                # Don't hold the connection if the statement can't be prepared
+                await self._release_write_conn()
+                raise
+        return self._launch_stmt
+
+    async def _release_write_conn(self):
+        """Return the dedicated write connection to the pool"""
+        conn, self._write_conn, self._launch_stmt = self._write_conn, None, None
+        if conn is not None:
+            try:
+                await self.db.release(conn)
+            except Exception as e:
+                logger.debug(f"Could not release write connection: {e}")
+
+    async def close(self):
+        """Release resources held by the scanner"""
+        workers = self._workers + self._realtime_workers
+        for worker in workers:
+            worker.cancel()
+        self._workers = []
+        self._realtime_workers = []
         
-        async with self.db.acquire() as conn:
-            # Get developer profile
-            profile = await conn.fetchrow("""
-                SELECT * FROM anubis.wallet_profiles
-                WHERE wallet_address = $1
-            """, creator)
-            
-            if profile:
-                # Check if this is a known rugger
-                if profile.get("total_rugs", 0) > 5:
-                    logger.warning(f"⚠️ KNOWN RUGGER ALERT: {creator}")
-                    # Here you would trigger Telegram alerts
-                    
-                # Check if this developer has successful history
-                if profile.get("successful_launches", 0) > 0:
-                    success_rate = profile["successful_launches"] / profile["total_launches"]
-                    if success_rate > 0.3:
-                        logger.info(f"✅ Successful developer detected: {creator} ({success_rate:.1%} success rate)")
-                        # Trigger positive alert
+        # Let cancelled workers finish unwinding so their held rows are back in the buffers
+        await asyncio.gather(*workers, return_exceptions=True)
+        
+        # Store launches the writer was holding or hadn't picked up yet
+        rows, self._unstored_launches = self._unstored_launches, []
+        while not self.launch_q.empty():
+            rows.append(self.launch_q.get_nowait())
+        if rows:
+            try:
+                await self._store_launches(rows)
+            except Exception as e:
+                logger.error(f"Error storing {len(rows)} launches: {e}")
+        
+        await self._flush_pending_retries()
+        
+        try:
+            await self._flush_realtime_launches()
+        except Exception as e:
+            logger.error(f"Error storing realtime launches: {e}")
+        await self._release_write_conn()
+        
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+        
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
 
 # END OF WALLETSCANNER CLASS
 
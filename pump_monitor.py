@@ -5,13 +5,21 @@ Real-time monitoring with NO hardcoded data
 
 import asyncio
 import aiohttp
+import calendar
 from datetime import datetime
 from typing import Optional, Dict, List
+from cachetools import LRUCache
 from solana.rpc.async_api import AsyncClient
 from solders.pubkey import Pubkey
 from solders.signature import Signature
 from loguru import logger
 import base58
+import numpy as np
+
+# Transactions fetched at once while classifying a page of signatures
+TX_FETCH_CONCURRENCY = 10
+# Signatures remembered across polls, so overlapping pages aren't re-fetched
+SEEN_SIGNATURES_MAX = 10_000
 
 class PumpFunMonitor:
     """Monitor Pump.fun for new token launches"""
@@ -24,6 +32,8 @@ class PumpFunMonitor:
         self.db = db
         self.monitoring = False
         self.last_signature = None
+        self._seen = LRUCache(maxsize=SEEN_SIGNATURES_MAX)
+        self._fetch_sem = asyncio.Semaphore(TX_FETCH_CONCURRENCY)
         
     async def start_monitoring(self):
         """Start monitoring for new launches"""
@@ -52,10 +62,21 @@ class PumpFunMonitor:
             if not response.value:
                 return
             
-            # Process new transactions
-            for sig_info in reversed(response.value):
-                if await self.is_token_creation(sig_info.signature):
-                    await self.process_new_launch(sig_info.signature)
+            # Failed and already seen transactions can't be new launches
+            candidates = [
+                sig_info.signature for sig_info in reversed(response.value)
+                if sig_info.err is None and sig_info.signature not in self._seen
+            ]
+            
+            # Fetch the candidates concurrently, then classify them locally
+            transactions = await asyncio.gather(
+                *(self._fetch_transaction(sig) for sig in candidates)
+            )
+            
+            for signature, tx in zip(candidates, transactions):
+                self._seen[signature] = True
+                if tx and self._is_creation_tx(tx):
+                    await self.process_new_launch(signature, tx)
             
             # Update last signature
             if response.value:
@@ -64,46 +85,49 @@ class PumpFunMonitor:
         except Exception as e:
             logger.error(f"Error checking launches: {e}")
     
-    async def is_token_creation(self, signature: Signature) -> bool:
-        """Check if transaction is a token creation"""
+    async def _fetch_transaction(self, signature: Signature):
+        """Fetch a parsed transaction, at most TX_FETCH_CONCURRENCY in flight"""
         try:
-            tx = await self.client.get_transaction(
-                signature,
-                encoding="jsonParsed",
-                max_supported_transaction_version=0
-            )
-            
-            if not tx.value:
-                return False
-            
-            # Look for token creation instructions
-            # This is simplified - you'd need to parse the actual instruction data
-            meta = tx.value.transaction.meta
-            if meta and meta.log_messages:
-                for log in meta.log_messages:
-                    if "CreateToken" in log or "InitializeMint" in log:
-                        return True
-                        
-            return False
+            async with self._fetch_sem:
+                tx = await self.client.get_transaction(
+                    signature,
+                    encoding="jsonParsed",
+                    max_supported_transaction_version=0
+                )
+            return tx.value
             
         except Exception as e:
-            logger.error(f"Error checking transaction {signature}: {e}")
-            return False
+            logger.error(f"Error fetching transaction {signature}: {e}")
+            return None
+    
+    @staticmethod
+    def _is_creation_tx(tx) -> bool:
+        """Look for token creation in an already fetched transaction's logs"""
+        # This is simplified - you'd need to parse the actual instruction data
+        meta = tx.transaction.meta
+        if meta and meta.log_messages:
+            for log in meta.log_messages:
+                if "CreateToken" in log or "InitializeMint" in log:
+                    return True
+        
+        return False
+    
+    async def is_token_creation(self, signature: Signature) -> bool:
+        """Check if transaction is a token creation"""
+        tx = await self._fetch_transaction(signature)
+        return bool(tx) and self._is_creation_tx(tx)
     
-    async def process_new_launch(self, signature: Signature):
-        """Process a new token launch"""
+    async def process_new_launch(self, signature: Signature, tx=None):
+        """Process a new token launch, reusing the transaction if already fetched"""
         try:
-            tx = await self.client.get_transaction(
-                signature,
-                encoding="jsonParsed",
-                max_supported_transaction_version=0
-            )
+            if tx is None:
+                tx = await self._fetch_transaction(signature)
             
-            if not tx.value:
+            if not tx:
                 return
             
             # Extract launch details
-            launch_data = await self.extract_launch_data(tx.value, str(signature))
+            launch_data = await self.extract_launch_data(tx, str(signature))
             
             if launch_data:
                 # Record to database
@@ -191,47 +215,41 @@ class PumpFunMonitor:
             # Get all launches by this developer
             async with self.db.acquire() as conn:
                 launches = await conn.fetch("""
-                    SELECT * FROM token_launches
+                    SELECT launch_time, initial_liquidity_sol, final_outcome
+                    FROM token_launches
                     WHERE creator_wallet = $1
                     ORDER BY launch_time DESC
                 """, wallet_address)
-                
-                if not launches:
-                    return {'status': 'no_data'}
-                
-                # Analyze patterns from ACTUAL data
-                patterns = {
-                    'total_launches': len(launches),
-                    'launch_times': [],
-                    'launch_days': [],
-                    'avg_liquidity': 0,
-                    'successful_count': 0
-                }
-                
-                total_liquidity = 0
-                for launch in launches:
-                    # Extract patterns
-                    patterns['launch_times'].append(launch['launch_time'].hour)
-                    patterns['launch_days'].append(launch['launch_time'].strftime('%A'))
-                    
-                    if launch['initial_liquidity_sol']:
-                        total_liquidity += float(launch['initial_liquidity_sol'])
-                    
-                    if launch['final_outcome'] == 'success':
-                        patterns['successful_count'] += 1
-                
-                # Calculate averages
-                if patterns['total_launches'] > 0:
-                    patterns['avg_liquidity'] = total_liquidity / patterns['total_launches']
-                    patterns['success_rate'] = (patterns['successful_count'] / patterns['total_launches']) * 100
-                
-                # Find most common launch hour
-                if patterns['launch_times']:
-                    from collections import Counter
-                    patterns['preferred_hour'] = Counter(patterns['launch_times']).most_common(1)[0][0]
-                    patterns['preferred_day'] = Counter(patterns['launch_days']).most_common(1)[0][0]
-                
-                return patterns
+            
+            if not launches:
+                return {'status': 'no_data'}
+            
+            # Unpack the launches into columns once, then aggregate with NumPy
+            count = len(launches)
+            hours = np.fromiter((l['launch_time'].hour for l in launches), dtype=np.int8, count=count)
+            days = np.fromiter((l['launch_time'].weekday() for l in launches), dtype=np.int8, count=count)
+            liquidity = np.fromiter(
+                (float(l['initial_liquidity_sol'] or 0) for l in launches), dtype=np.float64, count=count
+            )
+            successful = np.fromiter(
+                (l['final_outcome'] == 'success' for l in launches), dtype=np.bool_, count=count
+            )
+            
+            # Analyze patterns from ACTUAL data
+            patterns = {
+                'total_launches': count,
+                'launch_times': hours.tolist(),
+                'launch_days': [calendar.day_name[d] for d in days],
+                'avg_liquidity': float(liquidity.mean()),
+                'successful_count': int(successful.sum())
+            }
+            patterns['success_rate'] = (patterns['successful_count'] / count) * 100
+            
+            # Find most common launch hour and day
+            patterns['preferred_hour'] = int(np.bincount(hours, minlength=24).argmax())
+            patterns['preferred_day'] = calendar.day_name[int(np.bincount(days, minlength=7).argmax())]
+            
+            return patterns
                 
         except Exception as e:
             logger.error(f"Error analyzing patterns: {e}")
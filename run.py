@@ -4,41 +4,133 @@ Anubis Bot - Main Entry Point (Fixed with Historical Scanning)
 """
 
 import sys
-import logging
 import asyncio
 import os
+import time
 from datetime import datetime, timedelta
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import asyncpg
 from dotenv import load_dotenv
+from loguru import logger
+from database.database import init_connection
+
+# Scanner module is optional - scans are skipped without it
+try:
+    from modules.wallet_scanner import HistoricalScanner
+except ImportError:
+    HistoricalScanner = None
+
+# uvloop is optional - fall back to the default asyncio loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Load environment variables
 load_dotenv()
 
-# Configure basic logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)-8s | %(name)s:%(lineno)d - %(message)s'
+# Remove default logger and configure loguru
+logger.remove()
+logger.add(
+    sys.stderr,
+    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+    level=os.getenv('LOG_LEVEL', 'INFO'),
+    enqueue=True
 )
-logger = logging.getLogger(__name__)
+
+# Tables the bot needs - created at startup if missing
+SQL_CREATE_TABLES = """
+    -- system_config table for tracking scans
+    CREATE TABLE IF NOT EXISTS system_config (
+        config_key VARCHAR(255) PRIMARY KEY,
+        config_value JSONB,
+        last_scan_date TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- token_launches table
+    CREATE TABLE IF NOT EXISTS token_launches (
+        id BIGSERIAL PRIMARY KEY,
+        mint_address VARCHAR(64) UNIQUE,
+        creator_wallet VARCHAR(64),
+        platform VARCHAR(32),
+        launch_time TIMESTAMP WITH TIME ZONE,
+        metadata JSONB,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- scan_checkpoints table - newest signature scanned per program
+    CREATE TABLE IF NOT EXISTS scan_checkpoints (
+        program_id VARCHAR(64) PRIMARY KEY,
+        last_sig VARCHAR(128) NOT NULL,
+        last_block_time TIMESTAMP NOT NULL,
+        scanned_from TIMESTAMP NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+"""
+
+# How often the historical scan status is checked, in seconds
+SCAN_CHECK_INTERVAL = 24 * 60 * 60
+
+# Scan bookkeeping statements - kept as constants so every call sends the
+# identical text and hits the connection's prepared statement cache
+SQL_SELECT_SCAN = """
+    SELECT last_scan_date,
+           last_scan_date < NOW() - INTERVAL '7 days' AS is_stale,
+           EXTRACT(EPOCH FROM last_scan_date + INTERVAL '7 days' - NOW()) AS secs_until_stale
+    FROM system_config 
+    WHERE config_key = 'historical_scan_complete'
+"""
+
+SQL_UPSERT_SCAN = """
+    INSERT INTO system_config (config_key, config_value, last_scan_date)
+    VALUES ('historical_scan_complete', $1, NOW())
+    ON CONFLICT (config_key) 
+    DO UPDATE SET 
+        config_value = $1,
+        last_scan_date = NOW(),
+        updated_at = NOW()
+"""
+
+SQL_UPDATE_SCAN = """
+    UPDATE system_config 
+    SET last_scan_date = NOW(), 
+        updated_at = NOW()
+    WHERE config_key = 'historical_scan_complete'
+"""
 
 class AnubisBot:
     """Main bot class with integrated historical scanning"""
     
     def __init__(self):
         """Initialize the bot"""
-        self.scheduler = AsyncIOScheduler()
+        self._scan_task = None
         self.db = None
-        self.historical_scan_running = False
+        # Held for a whole status check and any scan it starts
+        self._scan_lock = asyncio.Lock()
         self.loop = None
+        self._shutdown = None
+        # (last_scan_date, monotonic expiry) of the last "up to date" status check
+        self._scan_cache = (None, 0.0)
+        # Dedicated connection for scan bookkeeping, one query at a time
+        self._config_conn = None
+        self._config_lock = asyncio.Lock()
         
     def run(self):
         """Main synchronous entry point that creates and manages the event loop"""
         try:
-            # Create new event loop
+            # Create new event loop - uvloop's when available
+            if uvloop:
+                uvloop.install()
             self.loop = asyncio.new_event_loop()
+            logger.debug(f"Event loop: {type(self.loop).__module__}.{type(self.loop).__name__}")
             asyncio.set_event_loop(self.loop)
             
+            # Tasks that finish without suspending skip the ready queue (Python 3.12+)
+            eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+            if eager_task_factory:
+                self.loop.set_task_factory(eager_task_factory)
+            
             # Run the async initialization and main loop
             self.loop.run_until_complete(self._async_run())
             
@@ -59,8 +151,8 @@ class AnubisBot:
             # Initialize components
             await self._initialize()
             
-            # Start scheduler
-            await self._start_scheduler()
+            # Start periodic tasks
+            await self._start_periodic_tasks()
             
             # Start the main bot logic
             await self._run_bot()
@@ -73,6 +165,9 @@ class AnubisBot:
         """Initialize all bot components"""
         logger.info("Initializing Anubis Bot components...")
         
+        # Set on shutdown - the main runtime just waits for it
+        self._shutdown = asyncio.Event()
+        
         # Initialize database
         await self._initialize_database()
         
@@ -90,16 +185,24 @@ class AnubisBot:
                 logger.error("DATABASE_URL not set in environment variables!")
                 raise ValueError("DATABASE_URL is required")
             
+            # Sized for one periodic job, the main loop and a scanner; idle
+            # connections are closed after max_inactive_connection_lifetime
             self.db = await asyncpg.create_pool(
                 database_url,
-                min_size=5,
-                max_size=20,
-                command_timeout=60
+                min_size=int(os.getenv('DB_POOL_MIN', '2')),
+                max_size=int(os.getenv('DB_POOL_MAX', '10')),
+                max_inactive_connection_lifetime=300,
+                max_queries=50000,
+                command_timeout=60,
+                statement_cache_size=1024,
+                init=init_connection
             )
             
             # Ensure required tables exist
             await self._ensure_tables_exist()
             
+            self._config_conn = await self.db.acquire()
+            
             logger.info("Database initialized successfully")
             
         except Exception as e:
@@ -109,107 +212,91 @@ class AnubisBot:
     async def _ensure_tables_exist(self):
         """Create necessary tables if they don't exist"""
         async with self.db.acquire() as conn:
-            # Create system_config table for tracking scans
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS system_config (
-                    config_key VARCHAR(255) PRIMARY KEY,
-                    config_value JSONB,
-                    last_scan_date TIMESTAMP WITH TIME ZONE,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
-            
-            # Create token_launches table if not exists
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS token_launches (
-                    id BIGSERIAL PRIMARY KEY,
-                    mint_address VARCHAR(64) UNIQUE,
-                    creator_wallet VARCHAR(64),
-                    platform VARCHAR(32),
-                    launch_time TIMESTAMP WITH TIME ZONE,
-                    metadata JSONB,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
+            # One multi-statement script - a single round-trip for all tables
+            await conn.execute(SQL_CREATE_TABLES)
             
             logger.info("Database tables verified/created")
     
-    async def _start_scheduler(self):
-        """Start the APScheduler for periodic tasks"""
-        # Schedule historical scan check
-        # Runs immediately on start, then every 24 hours
-        self.scheduler.add_job(
-            self._check_and_run_historical_scan,
-            'interval',
-            hours=24,
-            id='historical_scan_check',
-            next_run_time=datetime.now(),  # Run immediately
-            misfire_grace_time=3600  # 1 hour grace period
+    async def _start_periodic_tasks(self):
+        """Start the bot's periodic background tasks"""
+        # Historical scan check - runs immediately on start, then every 24 hours
+        self._scan_task = asyncio.create_task(
+            self._periodic(SCAN_CHECK_INTERVAL, self._check_and_run_historical_scan)
         )
         
-        # Add other scheduled tasks here
-        # self.scheduler.add_job(...)
+        # Add other periodic tasks here
         
-        # Start the scheduler
-        self.scheduler.start()
-        logger.info("Scheduler started successfully")
+        logger.info("Periodic tasks started successfully")
+    
+    async def _periodic(self, interval: float, job):
+        """Run job now and then every interval seconds until shutdown"""
+        while not self._shutdown.is_set():
+            try:
+                await job()
+            except Exception as e:
+                logger.error(f"Periodic job {job.__name__} failed: {e}")
+            
+            # Sleep until the next run, waking early on shutdown
+            try:
+                await asyncio.wait_for(self._shutdown.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
     
     async def _check_and_run_historical_scan(self):
         """Check if historical scan needs to run and execute if needed"""
-        if self.historical_scan_running:
+        if self._scan_lock.locked():
             logger.warning("Historical scan already running, skipping...")
             return
         
+        # An up-to-date result stays valid until the data turns stale
+        last_scan, expires = self._scan_cache
+        if time.monotonic() < expires:
+            logger.info(f"Historical scan last completed: {last_scan} (cached), skipping scan")
+            return
+        
+        async with self._scan_lock:
+            await self._check_scan_status()
+    
+    async def _check_scan_status(self):
+        """Read the scan status and run a full or incremental scan if one is due"""
         try:
-            async with self.db.acquire() as conn:
-                # Check if scan has been completed before
-                result = await conn.fetchrow("""
-                    SELECT config_value, last_scan_date 
-                    FROM system_config 
-                    WHERE config_key = 'historical_scan_complete'
-                """)
+            # Check if scan has been completed before
+            result = await self._config_query('fetchrow', SQL_SELECT_SCAN)
+            
+            if not result:
+                logger.info("=" * 60)
+                logger.info("NO HISTORICAL SCAN FOUND - STARTING INITIAL SCAN")
+                logger.info("=" * 60)
+                await self._run_historical_scan()
+            else:
+                last_scan = result['last_scan_date']
+                logger.info(f"Historical scan last completed: {last_scan}")
                 
-                if not result:
-                    logger.info("=" * 60)
-                    logger.info("NO HISTORICAL SCAN FOUND - STARTING INITIAL SCAN")
-                    logger.info("=" * 60)
-                    await self._run_historical_scan()
+                # Optional: Re-scan if data is older than 7 days
+                if result['is_stale']:
+                    logger.info("Historical data is stale (>7 days), running update scan...")
+                    await self._run_incremental_scan(last_scan)
                 else:
-                    last_scan = result['last_scan_date']
-                    logger.info(f"Historical scan last completed: {last_scan}")
-                    
-                    # Optional: Re-scan if data is older than 7 days
-                    if last_scan and last_scan < datetime.now(last_scan.tzinfo) - timedelta(days=7):
-                        logger.info("Historical data is stale (>7 days), running update scan...")
-                        await self._run_incremental_scan(last_scan)
-                    else:
-                        logger.info("Historical data is up to date, skipping scan")
+                    logger.info("Historical data is up to date, skipping scan")
+                    if result['secs_until_stale'] is not None:
+                        self._scan_cache = (
+                            last_scan, time.monotonic() + float(result['secs_until_stale'])
+                        )
                         
         except Exception as e:
             logger.error(f"Error checking historical scan status: {e}")
     
     async def _run_historical_scan(self):
         """Execute the full 3-year historical scan"""
-        self.historical_scan_running = True
+        if HistoricalScanner is None:
+            logger.error("wallet_scanner module not available, skipping historical scan")
+            return
+        
+        self._scan_cache = (None, 0.0)
         
         try:
             logger.info("Starting full historical scan (3 years)...")
             
-            # Import scanner module
-            try:
-                from modules.wallet_scanner import HistoricalScanner
-            except ImportError:
-                logger.error("wallet_scanner module not found! Creating placeholder...")
-                # Create a minimal scanner for testing
-                class HistoricalScanner:
-                    def __init__(self, db):
-                        self.db = db
-                    
-                    async def run_historical_scan(self, start_date, end_date):
-                        logger.info(f"Placeholder scan from {start_date} to {end_date}")
-                        return {"test": []}
-            
             # Initialize scanner
             scanner = HistoricalScanner(self.db)
             
@@ -219,28 +306,24 @@ class AnubisBot:
             
             logger.info(f"Scanning period: {start_date.date()} to {end_date.date()}")
             
-            # Run the scan
-            results = await scanner.run_historical_scan(start_date, end_date)
+            # Run the scan, counting each platform's launches as it is stored
+            total_tokens = 0
+            platforms_scanned = []
+            try:
+                async for platform, count in scanner.iter_historical_scan(start_date, end_date):
+                    total_tokens += count
+                    platforms_scanned.append(platform)
+            finally:
+                await scanner.close()
             
-            # Process results
-            total_tokens = sum(len(tokens) for tokens in results.values())
             logger.info(f"Scan found {total_tokens} total tokens")
             
             # Mark scan as complete
-            async with self.db.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO system_config (config_key, config_value, last_scan_date)
-                    VALUES ('historical_scan_complete', $1, NOW())
-                    ON CONFLICT (config_key) 
-                    DO UPDATE SET 
-                        config_value = $1,
-                        last_scan_date = NOW(),
-                        updated_at = NOW()
-                """, {
-                    'total_tokens': total_tokens,
-                    'scan_date': end_date.isoformat(),
-                    'platforms_scanned': list(results.keys())
-                })
+            await self._config_query('execute', SQL_UPSERT_SCAN, {
+                'total_tokens': total_tokens,
+                'scan_date': end_date.isoformat(),
+                'platforms_scanned': platforms_scanned
+            })
             
             logger.info("=" * 60)
             logger.info(f"HISTORICAL SCAN COMPLETE! Processed {total_tokens} tokens")
@@ -248,43 +331,58 @@ class AnubisBot:
             
         except Exception as e:
             logger.error(f"Historical scan failed: {e}")
-        finally:
-            self.historical_scan_running = False
     
     async def _run_incremental_scan(self, last_scan_date):
         """Run incremental scan from last scan date to now"""
-        self.historical_scan_running = True
+        if HistoricalScanner is None:
+            logger.error("Scanner module not available for incremental scan")
+            return
+        
+        self._scan_cache = (None, 0.0)
         
         try:
             logger.info(f"Running incremental scan from {last_scan_date}")
             
+            scanner = HistoricalScanner(self.db)
+            
             try:
-                from modules.wallet_scanner import HistoricalScanner
-                scanner = HistoricalScanner(self.db)
-                
-                results = await scanner.run_historical_scan(
+                async for platform, count in scanner.iter_historical_scan(
                     last_scan_date,
                     datetime.now()
-                )
-                
-                # Update scan date
-                async with self.db.acquire() as conn:
-                    await conn.execute("""
-                        UPDATE system_config 
-                        SET last_scan_date = NOW(), 
-                            updated_at = NOW()
-                        WHERE config_key = 'historical_scan_complete'
-                    """)
-                
-                logger.info("Incremental scan complete!")
-                
-            except ImportError:
-                logger.error("Scanner module not available for incremental scan")
+                ):
+                    logger.info(f"Incremental scan found {count} {platform} tokens")
+            finally:
+                await scanner.close()
+            
+            # Update scan date
+            await self._config_query('execute', SQL_UPDATE_SCAN)
+            
+            logger.info("Incremental scan complete!")
                 
         except Exception as e:
             logger.error(f"Incremental scan error: {e}")
-        finally:
-            self.historical_scan_running = False
+    
+    async def _config_query(self, method: str, query: str, *args):
+        """Run a scan bookkeeping query on the dedicated config connection"""
+        async with self._config_lock:
+            try:
+                if self._config_conn is None:
+                    self._config_conn = await self.db.acquire()
+                return await getattr(self._config_conn, method)(query, *args)
+            except (asyncpg.PostgresConnectionError, asyncpg.InterfaceError):
+                # Connection went bad - recycle it and retry once on a fresh one
+                await self._release_config_conn()
+                self._config_conn = await self.db.acquire()
+                return await getattr(self._config_conn, method)(query, *args)
+    
+    async def _release_config_conn(self):
+        """Return the dedicated config connection to the pool"""
+        conn, self._config_conn = self._config_conn, None
+        if conn is not None:
+            try:
+                await self.db.release(conn)
+            except Exception as e:
+                logger.debug(f"Could not release config connection: {e}")
     
     async def _run_bot(self):
         """Main bot runtime loop"""
@@ -292,15 +390,10 @@ class AnubisBot:
         
         # Your main bot logic here
         # For now, just keep the bot alive
+        # Nothing to poll - periodic tasks and the pool run on their own, and query
+        # errors surface on the code paths that use the database
         try:
-            while True:
-                # Main bot operations
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-                # You can add periodic status checks here
-                if not self.db:
-                    logger.error("Database connection lost!")
-                    break
+            await self._shutdown.wait()
                     
         except asyncio.CancelledError:
             logger.info("Bot runtime cancelled")
@@ -310,12 +403,20 @@ class AnubisBot:
         """Cleanup resources"""
         logger.info("Cleaning up resources...")
         
-        # Stop scheduler
-        if self.scheduler and self.scheduler.running:
-            self.scheduler.shutdown()
+        if self._shutdown:
+            self._shutdown.set()
+        
+        # Stop periodic tasks
+        if self._scan_task and not self._scan_task.done():
+            self._scan_task.cancel()
+            try:
+                await self._scan_task
+            except asyncio.CancelledError:
+                pass
             
         # Close database connection
         if self.db:
+            await self._release_config_conn()
             await self.db.close()
             
         logger.info("Cleanup complete")
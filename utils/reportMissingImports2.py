@@ -1,6 +1,7 @@
 """
 Module for handling missing imports reporting
 """
+from importlib.util import find_spec
 from loguru import logger
 
 def check_imports():
@@ -15,9 +16,8 @@ def check_imports():
     
     missing = []
     for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
+        # Locate the module without executing it
+        if find_spec(module) is None:
             missing.append(module)
     
     if missing: